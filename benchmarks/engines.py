@@ -0,0 +1,123 @@
+"""Сравнение движков извлечения данных bs4 и lxml.
+
+Страницы берутся из папки записей (см. record.py): страницы PEP,
+статьи whats-new и главная страница документации с боковой панелью.
+Каждая страница обрабатывается извлекателями обоих движков. Выводится
+лучшее время обработки страницы и число страниц, на которых результаты
+движков не совпали.
+
+Запуск из корня репозитория:
+    PYTHONPATH=src python benchmarks/engines.py --repeat 5
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from constants import BS4_ENGINE, LXML_ENGINE
+from extractors import (
+    PEP_STATUS_EXTRACTORS, VERSION_LINKS_EXTRACTORS, WHATS_NEW_EXTRACTORS
+)
+from standin import RECORDINGS_DIR
+
+ENGINES = (BS4_ENGINE, LXML_ENGINE)
+FIELDS = {
+    'pep-status': (PEP_STATUS_EXTRACTORS, 'peps.python.org/pep-*/index.html'),
+    'whats-new': (WHATS_NEW_EXTRACTORS, 'docs.python.org/3/whatsnew/3.*.html'),
+    'version-links': (
+        VERSION_LINKS_EXTRACTORS, 'docs.python.org/3/index.html'
+    ),
+}
+ROW_FORMAT = '{:<15}{:>7}{:>12}{:>12}{:>9}{:>12}'
+NO_RECORDINGS_MESSAGE = (
+    'Нет записанных страниц в {path}, запустите сначала record.py'
+)
+
+
+def load_pages(recordings_dir, pattern, pages_limit):
+    return [
+        path.read_text(encoding='utf-8')
+        for path in sorted(recordings_dir.glob(pattern))[:pages_limit]
+    ]
+
+
+def measure(extractor, pages, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [extractor(html) for html in pages]
+        best = min(best, time.perf_counter() - started)
+    return best / len(pages), results
+
+
+def run(recordings_dir, pages_limit, repeat):
+    report = {}
+    for field, (extractors, pattern) in FIELDS.items():
+        pages = load_pages(recordings_dir, pattern, pages_limit)
+        if not pages:
+            continue
+        timings = {}
+        results = {}
+        for engine in ENGINES:
+            timings[engine], results[engine] = measure(
+                extractors[engine], pages, repeat
+            )
+        report[field] = {
+            'pages': len(pages),
+            **{
+                f'{engine}_ms_per_page': round(timings[engine] * 1000, 3)
+                for engine in ENGINES
+            },
+            'speedup': round(timings[BS4_ENGINE] / timings[LXML_ENGINE], 2),
+            'mismatches': sum(
+                bs4_result != lxml_result for bs4_result, lxml_result in zip(
+                    results[BS4_ENGINE], results[LXML_ENGINE]
+                )
+            ),
+        }
+    return report
+
+
+def print_report(report):
+    print(ROW_FORMAT.format(
+        'field', 'pages', 'bs4 ms', 'lxml ms', 'speedup', 'mismatches'
+    ))
+    for field, row in report.items():
+        print(ROW_FORMAT.format(
+            field, row['pages'], row['bs4_ms_per_page'],
+            row['lxml_ms_per_page'], row['speedup'], row['mismatches']
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Сравнение движков извлечения данных'
+    )
+    parser.add_argument(
+        '--recordings', type=Path, default=RECORDINGS_DIR,
+        help='Папка с записанными страницами'
+    )
+    parser.add_argument(
+        '--pages', type=int, default=100,
+        help='Сколько страниц каждого вида обрабатывать'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='Количество повторов замера'
+    )
+    parser.add_argument(
+        '--json', type=Path,
+        help='Путь для сохранения результатов в JSON'
+    )
+    args = parser.parse_args()
+    if not args.recordings.is_dir():
+        sys.exit(NO_RECORDINGS_MESSAGE.format(path=args.recordings))
+    report = run(args.recordings, args.pages, args.repeat)
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""Замер времени запуска парсера для каждого режима.
+
+Каждый сценарий (``-h`` и каждый режим с выбранными способами вывода)
+запускается в отдельном процессе ``python -X importtime`` поверх
+standin.py. Дочерний процесс выводит метку до загрузки парсера и сам
+ничего не импортирует, поэтому в замер попадают только модули, которые
+загружает парсер. Для каждого сценария выводятся число загруженных
+модулей, суммарное время импорта, полное время работы процесса и самые
+тяжёлые импорты верхнего уровня (в том числе отложенные импорты внутри
+функций).
+
+Запуск из корня репозитория:
+    PYTHONPATH=src python benchmarks/import_time.py --outputs default pretty
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / 'src'
+MODES = ('whats-new', 'latest-versions', 'download', 'pep')
+OUTPUTS = ('default', 'pretty', 'file', 'sqlite')
+HELP_SCENARIO = '-h'
+MARKER = 'import-time-benchmark: start'
+IMPORT_TIME_PREFIX = 'import time:'
+CHILD_CODE = (
+    'import sys\n'
+    'print({marker!r}, file=sys.stderr, flush=True)\n'
+    'import constants\n'
+    'constants.BASE_DIR = constants.Path.cwd()\n'
+    '{redirect}'
+    'import main\n'
+    'sys.argv = {argv!r}\n'
+    'main.main()\n'
+)
+REDIRECT_CODE = (
+    'import sessions\n'
+    'from redirect import redirect_sessions\n'
+    'redirect_sessions({base_url!r})\n'
+)
+ROW_FORMAT = '{:<26}{:>8}{:>11}{:>10}  {}'
+NO_RECORDINGS_MESSAGE = (
+    'Нет записанных страниц в {path}, запустите сначала record.py'
+)
+
+
+def parse_import_times(stderr):
+    lines = stderr.splitlines()
+    lines = lines[lines.index(MARKER) + 1:] if MARKER in lines else lines
+    modules = []
+    for line in lines:
+        if not line.startswith(IMPORT_TIME_PREFIX):
+            continue
+        _, cumulative, name = line[len(IMPORT_TIME_PREFIX):].split('|')
+        if cumulative.strip().isdigit():
+            modules.append((name.rstrip(), int(cumulative)))
+    top_level = sorted(
+        (
+            (name, cumulative) for name, cumulative in modules
+            if not name.startswith('  ')
+        ),
+        key=lambda item: item[1],
+        reverse=True
+    )
+    return {
+        'modules': len(modules),
+        'import_ms': round(
+            sum(cumulative for _, cumulative in top_level) / 1000, 2
+        ),
+        'heaviest': [
+            [name.strip(), round(cumulative / 1000, 2)]
+            for name, cumulative in top_level[:5]
+        ],
+    }
+
+
+def measure(argv, base_url):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        (str(SRC_DIR), str(BENCHMARKS_DIR))
+    ))
+    with tempfile.TemporaryDirectory() as work_dir:
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [
+                sys.executable, '-X', 'importtime', '-c', CHILD_CODE.format(
+                    marker=MARKER,
+                    redirect=REDIRECT_CODE.format(base_url=base_url)
+                    if base_url else '',
+                    argv=['main.py', *argv]
+                )
+            ],
+            cwd=work_dir, env=env, capture_output=True, text=True,
+            check=True
+        )
+        wall = time.perf_counter() - started
+    return dict(
+        wall_ms=round(wall * 1000, 1),
+        **parse_import_times(completed.stderr)
+    )
+
+
+def scenarios(outputs):
+    yield HELP_SCENARIO, [HELP_SCENARIO]
+    for mode in MODES:
+        for output in outputs:
+            if mode == 'download' and output != OUTPUTS[0]:
+                continue
+            argv = [mode] if output == OUTPUTS[0] else [mode, '-o', output]
+            yield ' '.join(argv), argv
+
+
+def run_suite(args):
+    from standin import MEBIBYTE, start_server
+
+    server = start_server(args.recordings, archive_size=MEBIBYTE)
+    base_url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+    try:
+        return {
+            name: measure(argv, None if argv == [HELP_SCENARIO] else base_url)
+            for name, argv in scenarios(args.outputs)
+        }
+    finally:
+        server.shutdown()
+
+
+def print_report(report):
+    print(ROW_FORMAT.format(
+        'scenario', 'modules', 'import ms', 'wall ms', 'heaviest'
+    ))
+    for name, row in report.items():
+        print(ROW_FORMAT.format(
+            name, row['modules'], row['import_ms'], row['wall_ms'],
+            ', '.join(f'{module} {ms}' for module, ms in row['heaviest'])
+        ))
+
+
+def configure_argument_parser():
+    parser = argparse.ArgumentParser(
+        description='Замер времени запуска режимов парсера'
+    )
+    parser.add_argument(
+        '--outputs', nargs='+', choices=OUTPUTS, default=OUTPUTS[:1],
+        help='Способы вывода результатов для замера'
+    )
+    parser.add_argument(
+        '--recordings', type=Path,
+        default=BENCHMARKS_DIR / 'recordings',
+        help='Папка с записанными страницами'
+    )
+    parser.add_argument(
+        '--output', type=Path,
+        help='Путь для сохранения результатов в JSON'
+    )
+    return parser
+
+
+def main():
+    args = configure_argument_parser().parse_args()
+    if not args.recordings.is_dir():
+        sys.exit(NO_RECORDINGS_MESSAGE.format(path=args.recordings))
+    report = run_suite(args)
+    print_report(report)
+    if args.output:
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding='utf-8'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""Сравнение полного разбора страниц с частичным (SoupStrainer).
+
+Для каждого режима страницы загружаются один раз через кеширующую
+сессию, после чего каждая разбирается целиком и только в пределах
+нужного режиму поддерева. Выводятся лучшее время разбора страницы
+и пик памяти по данным tracemalloc.
+
+Запуск из корня репозитория:
+    PYTHONPATH=src python benchmarks/parse_only.py --pages 50
+"""
+import argparse
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from urllib.parse import urljoin
+
+import requests_cache
+
+from constants import DOWNLOAD_URL, MAIN_DOC_URL, MAIN_PEPS_URL
+from extractors import (
+    DOWNLOAD_STRAINER, PEP_INDEX_STRAINER, PEP_PAGE_STRAINER,
+    SIDEBAR_STRAINER, WHATS_NEW_INDEX_STRAINER, WHATS_NEW_PAGE_STRAINER
+)
+from utils import get_response, make_soup
+
+CACHE_NAME = str(Path(__file__).resolve().parent / 'bench_cache')
+ROW_FORMAT = '{:<16}{:>8}{:>14}{:>14}{:>12}{:>12}'
+
+
+def collect_pages(session, pages_limit):
+    pep_index = get_response(session, MAIN_PEPS_URL).text
+    pep_links = [
+        urljoin(MAIN_PEPS_URL, a['href'])
+        for a in make_soup(pep_index, parse_only=PEP_INDEX_STRAINER).select(
+            'a.pep.reference.internal'
+        )
+    ][:pages_limit]
+    whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
+    whats_new_index = get_response(session, whats_new_url).text
+    whats_new_links = [
+        urljoin(whats_new_url, a['href'])
+        for a in make_soup(
+            whats_new_index, parse_only=WHATS_NEW_INDEX_STRAINER
+        ).select('div.toctree-wrapper li.toctree-l1 > a.reference')
+    ][:pages_limit]
+    return {
+        'pep': [(pep_index, PEP_INDEX_STRAINER)] + [
+            (get_response(session, link).text, PEP_PAGE_STRAINER)
+            for link in pep_links
+        ],
+        'whats-new': [(whats_new_index, WHATS_NEW_INDEX_STRAINER)] + [
+            (get_response(session, link).text, WHATS_NEW_PAGE_STRAINER)
+            for link in whats_new_links
+        ],
+        'latest-versions': [
+            (get_response(session, MAIN_DOC_URL).text, SIDEBAR_STRAINER)
+        ],
+        'download': [
+            (get_response(session, DOWNLOAD_URL).text, DOWNLOAD_STRAINER)
+        ],
+    }
+
+
+def measure(pages, strained, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for html, strainer in pages:
+            make_soup(html, parse_only=strainer if strained else None)
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    for html, strainer in pages:
+        make_soup(html, parse_only=strainer if strained else None)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best / len(pages), peak
+
+
+def run(pages_by_mode, repeat):
+    report = {}
+    for mode, pages in pages_by_mode.items():
+        full_time, full_peak = measure(pages, False, repeat)
+        part_time, part_peak = measure(pages, True, repeat)
+        report[mode] = {
+            'pages': len(pages),
+            'full_parse_ms': round(full_time * 1000, 3),
+            'strained_parse_ms': round(part_time * 1000, 3),
+            'full_peak_kib': full_peak // 1024,
+            'strained_peak_kib': part_peak // 1024,
+        }
+    return report
+
+
+def print_report(report):
+    print(ROW_FORMAT.format(
+        'mode', 'pages', 'full ms/page', 'part ms/page',
+        'full KiB', 'part KiB'
+    ))
+    for mode, row in report.items():
+        print(ROW_FORMAT.format(
+            mode, row['pages'], row['full_parse_ms'],
+            row['strained_parse_ms'], row['full_peak_kib'],
+            row['strained_peak_kib']
+        ))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Замер частичного разбора страниц'
+    )
+    parser.add_argument(
+        '--pages', type=int, default=30,
+        help='Сколько страниц PEP и whats-new разбирать'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='Количество повторов замера'
+    )
+    parser.add_argument(
+        '--json', type=Path,
+        help='Путь для сохранения результатов в JSON'
+    )
+    args = parser.parse_args()
+    session = requests_cache.CachedSession(CACHE_NAME)
+    report = run(collect_pages(session, args.pages), args.repeat)
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Запись страниц docs.python.org и peps.python.org для офлайн-замеров.
+
+Режимы парсера прогоняются с обычной сессией requests, а каждый
+успешный HTML- и JSON-ответ сохраняется в папку записей в раскладке,
+которую ожидает standin.py. Режим pep записывается с источником html,
+чтобы сохранить страницы всех PEP, а api/peps.json загружается
+отдельно, поэтому замеры можно гонять с любым источником. Архивы
+документации не записываются: сервер-заглушка генерирует их сам.
+
+Запуск из корня репозитория (нужен доступ в сеть):
+    PYTHONPATH=src python benchmarks/record.py
+"""
+import argparse
+from collections import deque
+from functools import partial
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+
+import main
+from constants import DOWNLOAD_URL, HTML_SOURCE, PEPS_JSON_URL
+from standin import RECORDINGS_DIR, recorded_path
+from utils import get_response
+
+RECORDED_MESSAGE = 'Записано страниц: {count}, папка: {path}'
+RECORDED_MODES = ('whats-new', 'latest-versions', 'pep')
+RECORDED_CONTENT_TYPES = ('html', 'json')
+
+
+def save_response(recordings_dir, saved, response, *args, **kwargs):
+    content_type = response.headers.get('Content-Type', '')
+    if not response.ok or not any(
+        recorded in content_type for recorded in RECORDED_CONTENT_TYPES
+    ):
+        return
+    parts = urlsplit(response.url)
+    path = recorded_path(recordings_dir, parts.netloc, parts.path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(response.content)
+    saved.add(response.url)
+
+
+def record(recordings_dir, workers):
+    saved = set()
+    session = requests.Session()
+    session.hooks['response'].append(
+        partial(save_response, recordings_dir, saved)
+    )
+    cli_args = argparse.Namespace(workers=workers, source=HTML_SOURCE)
+    for mode in RECORDED_MODES:
+        deque(main.MODE_TO_FUNCTION[mode](session, cli_args), maxlen=0)
+    for url in (DOWNLOAD_URL, PEPS_JSON_URL):
+        get_response(session, url)
+    return len(saved)
+
+
+def run():
+    parser = argparse.ArgumentParser(
+        description='Запись страниц для офлайн-замеров'
+    )
+    parser.add_argument(
+        '--recordings', type=Path, default=RECORDINGS_DIR,
+        help='Папка для записанных страниц'
+    )
+    parser.add_argument(
+        '--workers', type=int, default=8,
+        help='Количество параллельных загрузок'
+    )
+    args = parser.parse_args()
+    count = record(args.recordings, args.workers)
+    print(RECORDED_MESSAGE.format(count=count, path=args.recordings))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,41 @@
+"""Адаптер сессии, перенаправляющий запросы на сервер-заглушку.
+
+Запросы к настоящим адресам уходят на ``<base_url>/<хост>/<путь>``,
+ключи кеша requests_cache при этом не меняются. Модуль импортирует
+только то, что парсер и так загружает, поэтому его можно подключать
+при замере времени импорта.
+"""
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+
+class StandinAdapter(HTTPAdapter):
+    def __init__(self, base_url, **kwargs):
+        self.base_url = base_url.rstrip('/')
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = f'{self.base_url}/{parts.netloc}{parts.path}' + (
+            f'?{parts.query}' if parts.query else ''
+        )
+        return super().send(request, **kwargs)
+
+
+def mount_standin(session, base_url):
+    adapter = StandinAdapter(base_url)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def redirect_sessions(base_url):
+    import sessions
+
+    create_session = sessions.create_session
+
+    def create_redirected_session(*args, **kwargs):
+        return mount_standin(create_session(*args, **kwargs), base_url)
+
+    sessions.create_session = create_redirected_session
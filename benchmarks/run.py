@@ -0,0 +1,212 @@
+"""Офлайн-замеры всех режимов парсера.
+
+Поднимает standin.py поверх записанных страниц и для каждого режима
+запускает два отдельных процесса с общей папкой кеша: первый с пустым
+кешем (cold), второй с кешем, заполненным первым (warm). Каждый
+процесс сообщает время работы, число запрошенных страниц, страниц в
+секунду, среднее время разбора страницы и пиковый RSS. Время разбора
+берётся из этапа extract метрик парсера, поэтому оно учитывает оба
+движка (--engine) и разбор в отдельных процессах (--parse-workers). Итог
+сохраняется в JSON вместе с хешем коммита, чтобы сравнивать коммиты
+между собой.
+
+Запуск из корня репозитория:
+    PYTHONPATH=src python benchmarks/run.py --latency 50 --output report.json
+"""
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+
+from constants import DEFAULT_PEP_SOURCE, HTML_SOURCE, JSON_SOURCE
+from redirect import mount_standin
+from standin import MEBIBYTE, RECORDINGS_DIR, start_server
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+SRC_DIR = BENCHMARKS_DIR.parent / 'src'
+MODES = ('whats-new', 'latest-versions', 'download', 'pep')
+CONDITIONS = ('cold', 'warm')
+PEP_SOURCES = (JSON_SOURCE, HTML_SOURCE)
+ROW_FORMAT = '{:<16}{:<6}{:>9}{:>7}{:>10}{:>10}{:>11}'
+NO_RECORDINGS_MESSAGE = (
+    'Нет записанных страниц в {path}, запустите сначала record.py'
+)
+
+
+def measure_mode(mode, base_url, workers, parse_workers, engine, source):
+    import main
+    import metrics
+    import utils
+    from sessions import create_session
+
+    main.BASE_DIR = Path.cwd()
+    cli_args = argparse.Namespace(
+        workers=workers, parse_workers=parse_workers, engine=engine,
+        source=source
+    )
+    session = mount_standin(create_session(cli_args), base_url)
+    started = time.perf_counter()
+    results = main.MODE_TO_FUNCTION[mode](session, cli_args)
+    if results is not None:
+        deque(results, maxlen=0)
+    wall = time.perf_counter() - started
+    pages = sum(utils.CACHE_STATS.values())
+    extract = metrics.snapshot()['stages'].get(
+        'extract', dict(count=0, total_seconds=0)
+    )
+    return {
+        'wall_s': round(wall, 4),
+        'pages': pages,
+        'pages_per_s': round(pages / wall, 2) if wall else None,
+        'parsed_pages': extract['count'],
+        'parse_ms_per_page': round(
+            extract['total_seconds'] * 1000 / extract['count'], 3
+        ) if extract['count'] else None,
+        'peak_rss_kib': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        'cache': dict(utils.CACHE_STATS),
+    }
+
+
+def run_child(mode, work_dir, base_url, args, source):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        (str(SRC_DIR), str(BENCHMARKS_DIR))
+    ))
+    completed = subprocess.run(
+        [
+            sys.executable, str(Path(__file__).resolve()), '--child', mode,
+            '--base-url', base_url, '--workers', str(args.workers),
+            '--parse-workers', str(args.parse_workers),
+            '--engine', args.engine, '--source', source
+        ],
+        cwd=work_dir, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def current_commit():
+    completed = subprocess.run(
+        ['git', 'rev-parse', 'HEAD'], cwd=BENCHMARKS_DIR,
+        capture_output=True, text=True
+    )
+    return completed.stdout.strip() or None
+
+
+def mode_sources(mode, args):
+    return args.pep_sources if mode == 'pep' else (DEFAULT_PEP_SOURCE,)
+
+
+def run_suite(args):
+    server = start_server(
+        args.recordings, args.latency / 1000, args.archive_size * MEBIBYTE
+    )
+    base_url = 'http://127.0.0.1:{}'.format(server.server_address[1])
+    scenarios = []
+    try:
+        for mode in args.modes:
+            for source in mode_sources(mode, args):
+                with tempfile.TemporaryDirectory() as work_dir:
+                    for condition in CONDITIONS:
+                        scenarios.append(dict(
+                            mode=mode, source=source, condition=condition,
+                            **run_child(mode, work_dir, base_url, args, source)
+                        ))
+    finally:
+        server.shutdown()
+    return {
+        'commit': current_commit(),
+        'created_at': dt.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'latency_ms': args.latency,
+        'workers': args.workers,
+        'parse_workers': args.parse_workers,
+        'engine': args.engine,
+        'pep_sources': args.pep_sources,
+        'scenarios': scenarios,
+    }
+
+
+def print_report(report):
+    print(ROW_FORMAT.format(
+        'mode', 'cache', 'wall s', 'pages', 'pages/s', 'parse ms', 'RSS KiB'
+    ))
+    for row in report['scenarios']:
+        print(ROW_FORMAT.format(
+            row['mode'] if row['mode'] != 'pep' else (
+                '{mode}/{source}'.format(**row)
+            ),
+            row['condition'], row['wall_s'], row['pages'],
+            str(row['pages_per_s']), str(row['parse_ms_per_page']),
+            row['peak_rss_kib']
+        ))
+
+
+def configure_argument_parser():
+    parser = argparse.ArgumentParser(
+        description='Офлайн-замеры режимов парсера'
+    )
+    parser.add_argument(
+        '--modes', nargs='+', choices=MODES, default=MODES,
+        help='Режимы для замера'
+    )
+    parser.add_argument(
+        '--latency', type=float, default=0,
+        help='Задержка каждого ответа сервера-заглушки, мс'
+    )
+    parser.add_argument(
+        '--archive-size', type=int, default=16,
+        help='Размер генерируемого архива документации, МиБ'
+    )
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--parse-workers', type=int, default=1)
+    parser.add_argument(
+        '--engine', choices=('bs4', 'lxml'), default='bs4',
+        help='Движок извлечения данных из страниц'
+    )
+    parser.add_argument(
+        '--pep-sources', nargs='+', choices=PEP_SOURCES,
+        default=PEP_SOURCES,
+        help='Источники статусов для замеров режима pep'
+    )
+    parser.add_argument(
+        '--recordings', type=Path, default=RECORDINGS_DIR,
+        help='Папка с записанными страницами'
+    )
+    parser.add_argument(
+        '--output', type=Path, default=Path('benchmark_report.json'),
+        help='Путь для сохранения результатов в JSON'
+    )
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument(
+        '--source', default=DEFAULT_PEP_SOURCE, help=argparse.SUPPRESS
+    )
+    parser.add_argument('--base-url', help=argparse.SUPPRESS)
+    return parser
+
+
+def main():
+    args = configure_argument_parser().parse_args()
+    if args.child:
+        print(json.dumps(measure_mode(
+            args.child, args.base_url, args.workers, args.parse_workers,
+            args.engine, args.source
+        )))
+        return
+    if not args.recordings.is_dir():
+        sys.exit(NO_RECORDINGS_MESSAGE.format(path=args.recordings))
+    report = run_suite(args)
+    print_report(report)
+    args.output.write_text(
+        json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8'
+    )
+
+
+if __name__ == '__main__':
+    main()
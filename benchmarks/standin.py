@@ -0,0 +1,122 @@
+"""Локальный HTTP-сервер, подменяющий docs.python.org и peps.python.org.
+
+Страницы берутся из папки записей (см. record.py), где путь файла
+повторяет адрес страницы: ``<хост>/<путь>``, а адрес, оканчивающийся
+на ``/``, хранится как ``index.html``. Каждый ответ задерживается на
+заданное время, чтобы имитировать сеть. Архивы документации, которых
+нет среди записей, генерируются на лету нужного размера; для них
+поддерживаются HEAD, ETag и запросы диапазонов байт.
+
+Перенаправить на этот сервер запросы сессии можно адаптером из
+redirect.py.
+"""
+import hashlib
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+RECORDINGS_DIR = Path(__file__).resolve().parent / 'recordings'
+INDEX_FILE_NAME = 'index.html'
+ARCHIVE_SUFFIXES = ('.zip', '.epub', '.bz2')
+JSON_SUFFIX = '.json'
+ARCHIVE_PATTERN = b'python-docs-archive-'
+MEBIBYTE = 1024 * 1024
+
+
+def recorded_path(recordings_dir, netloc, path):
+    relative = path.lstrip('/')
+    if not relative or relative.endswith('/'):
+        relative += INDEX_FILE_NAME
+    return recordings_dir / netloc / relative
+
+
+def content_type(path):
+    if path.endswith(ARCHIVE_SUFFIXES):
+        return 'application/octet-stream'
+    if path.endswith(JSON_SUFFIX):
+        return 'application/json'
+    return 'text/html'
+
+
+def synthetic_archive(size):
+    repeats = -(-size // len(ARCHIVE_PATTERN))
+    return (ARCHIVE_PATTERN * repeats)[:size]
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, *args, recordings_dir, latency, archive_size,
+                 **kwargs):
+        self.recordings_dir = recordings_dir
+        self.latency = latency
+        self.archive_size = archive_size
+        super().__init__(*args, **kwargs)
+
+    def log_message(self, *args):
+        pass
+
+    def load_body(self):
+        netloc, _, path = self.path.lstrip('/').partition('/')
+        file_path = recorded_path(self.recordings_dir, netloc, '/' + path)
+        if file_path.is_file():
+            return file_path.read_bytes()
+        if path.endswith(ARCHIVE_SUFFIXES):
+            return synthetic_archive(self.archive_size)
+        return None
+
+    def send_body(self, with_body):
+        time.sleep(self.latency)
+        body = self.load_body()
+        if body is None:
+            self.send_error(404)
+            return
+        status, start, end = 200, 0, len(body) - 1
+        byte_range = self.headers.get('Range', '')
+        if byte_range.startswith('bytes='):
+            first, _, last = byte_range[len('bytes='):].partition('-')
+            status, start = 206, int(first)
+            end = min(int(last), end) if last else end
+        etag = '"{}"'.format(hashlib.sha1(body).hexdigest())
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header('ETag', etag)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Type', content_type(self.path))
+        self.send_header('Content-Length', str(end - start + 1))
+        if status == 206:
+            self.send_header(
+                'Content-Range', f'bytes {start}-{end}/{len(body)}'
+            )
+        self.end_headers()
+        if with_body:
+            self.wfile.write(body[start:end + 1])
+
+    def do_GET(self):
+        self.send_body(with_body=True)
+
+    def do_HEAD(self):
+        self.send_body(with_body=False)
+
+
+def start_server(recordings_dir=RECORDINGS_DIR, latency=0.0,
+                 archive_size=MEBIBYTE, port=0):
+    server = ThreadingHTTPServer(
+        ('127.0.0.1', port),
+        partial(
+            StandinHandler,
+            recordings_dir=Path(recordings_dir),
+            latency=latency,
+            archive_size=archive_size
+        )
+    )
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
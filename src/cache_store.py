@@ -0,0 +1,212 @@
+from functools import partial
+import pickle
+import sqlite3
+import time
+import zlib
+
+from requests_cache import SQLiteCache
+from requests_cache.backends.sqlite import SQLiteDict
+from requests_cache.serializers import SerializerPipeline, Stage
+from requests_cache.serializers.preconf import base_stage
+
+from constants import (
+    CACHEABLE_CONTENT_TYPES, CACHE_COMPRESSION_LEVEL, CACHE_EVICT_TARGET,
+    CACHE_TOUCH_BATCH, MAX_CACHED_BODY
+)
+
+STATS_TABLE = 'run_stats'
+
+
+def decompress(data):
+    try:
+        return zlib.decompress(data)
+    except zlib.error:
+        return data
+
+
+compressed_serializer = SerializerPipeline(
+    [
+        base_stage,
+        Stage(pickle),
+        Stage(
+            dumps=partial(zlib.compress, level=CACHE_COMPRESSION_LEVEL),
+            loads=decompress
+        )
+    ],
+    name='pickle_zlib',
+    is_binary=True
+)
+
+
+def is_cacheable(response):
+    content_type = response.headers.get('Content-Type', '')
+    length = response.headers.get('Content-Length', '')
+    if length.isdigit() and int(length) > MAX_CACHED_BODY:
+        return False
+    return not content_type or content_type.startswith(
+        CACHEABLE_CONTENT_TYPES
+    )
+
+
+class BoundedSQLiteDict(SQLiteDict):
+    def __init__(self, *args, max_size=None, **kwargs):
+        self.max_size = max_size
+        self.touched = {}
+        self.total = None
+        super().__init__(*args, **kwargs)
+
+    def init_db(self):
+        super().init_db()
+        with self.connection(commit=True) as con:
+            for column in ('used_at REAL', 'size INTEGER'):
+                try:
+                    con.execute(
+                        f'ALTER TABLE {self.table_name} ADD COLUMN {column}'
+                    )
+                except sqlite3.OperationalError:
+                    pass
+            con.execute(
+                'CREATE INDEX IF NOT EXISTS used_at_idx '
+                f'ON {self.table_name}(used_at)'
+            )
+            self.total = self.total_size(con)
+            if self.max_size:
+                self.evict(con)
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        with self._lock:
+            self.touched[key] = time.time()
+            if len(self.touched) >= CACHE_TOUCH_BATCH:
+                self.flush_touched()
+        return value
+
+    def _write(self, key, value):
+        expires = getattr(value, 'expires_unix', None)
+        value = self.serialize(value)
+        with self.connection(commit=True) as con:
+            if self.total is None:
+                self.total = self.total_size(con)
+            replaced = con.execute(
+                f'SELECT COALESCE(size, LENGTH(value)) '
+                f'FROM {self.table_name} WHERE key = ?',
+                (key,)
+            ).fetchone()
+            con.execute(
+                f'INSERT OR REPLACE INTO {self.table_name} '
+                '(key, value, expires, used_at, size) VALUES (?, ?, ?, ?, ?)',
+                (key, value, expires, time.time(), len(value))
+            )
+            self.touched.pop(key, None)
+            self.total += len(value) - (replaced[0] if replaced else 0)
+            if self.max_size and self.total > self.max_size:
+                self.evict(con)
+
+    def __delitem__(self, key):
+        with self._lock:
+            super().__delitem__(key)
+            self.total = None
+
+    def bulk_delete(self, keys=None, values=None):
+        with self._lock:
+            super().bulk_delete(keys, values)
+            self.total = None
+
+    def flush_touched(self):
+        with self._lock:
+            if not self.touched:
+                return
+            with self.connection(commit=True) as con:
+                con.executemany(
+                    f'UPDATE {self.table_name} SET used_at = ? WHERE key = ?',
+                    [(used_at, key) for key, used_at in self.touched.items()]
+                )
+            self.touched.clear()
+
+    def evict(self, con):
+        total = self.total = self.total_size(con)
+        if total <= self.max_size:
+            return
+        self.flush_touched()
+        evicted = []
+        for key, size in con.execute(
+            f'SELECT key, COALESCE(size, LENGTH(value)) '
+            f'FROM {self.table_name} ORDER BY COALESCE(used_at, 0)'
+        ).fetchall():
+            if total <= self.max_size * CACHE_EVICT_TARGET:
+                break
+            evicted.append((key,))
+            total -= size
+        con.executemany(
+            f'DELETE FROM {self.table_name} WHERE key = ?', evicted
+        )
+        self.total = total
+
+    def total_size(self, con):
+        return con.execute(
+            'SELECT COALESCE(SUM(COALESCE(size, LENGTH(value))), 0) '
+            f'FROM {self.table_name}'
+        ).fetchone()[0]
+
+    def close(self):
+        self.flush_touched()
+        super().close()
+
+
+class BoundedSQLiteCache(SQLiteCache):
+    def __init__(self, db_path, max_size=None, **kwargs):
+        super().__init__(db_path, **kwargs)
+        self.responses.close()
+        self.responses = BoundedSQLiteDict(
+            db_path,
+            table_name='responses',
+            serializer=compressed_serializer,
+            max_size=max_size,
+            **kwargs
+        )
+        self.redirects.close()
+        self.redirects = SQLiteDict(
+            db_path,
+            table_name='redirects',
+            lock=self.responses._lock,
+            serializer=None,
+            **kwargs
+        )
+
+
+def save_run_stats(cache, stats):
+    with cache.responses.connection(commit=True) as con:
+        con.execute(
+            f'CREATE TABLE IF NOT EXISTS {STATS_TABLE} '
+            '(name TEXT PRIMARY KEY, value INTEGER)'
+        )
+        con.executemany(
+            f'INSERT INTO {STATS_TABLE} VALUES (?, ?) ON CONFLICT(name) '
+            'DO UPDATE SET value = value + excluded.value',
+            list(stats.items())
+        )
+
+
+def cache_stats(cache):
+    responses = cache.responses
+    with responses.connection() as con:
+        entries, body_bytes = con.execute(
+            'SELECT COUNT(key), COALESCE(SUM(LENGTH(value)), 0) '
+            f'FROM {responses.table_name}'
+        ).fetchone()
+        try:
+            totals = dict(con.execute(
+                f'SELECT name, value FROM {STATS_TABLE}'
+            ))
+        except sqlite3.OperationalError:
+            totals = {}
+    hits = totals.get('hit', 0) + totals.get('revalidated', 0)
+    requests = hits + totals.get('miss', 0)
+    return dict(
+        entries=entries,
+        body_bytes=body_bytes,
+        file_bytes=responses.size(),
+        hits=hits,
+        misses=totals.get('miss', 0),
+        hit_ratio=hits / requests if requests else 0.0
+    )
@@ -0,0 +1,102 @@
+import json
+import logging
+import os
+
+from constants import (
+    BASE_DIR, CHECKPOINT_FILE_NAME, CHECKPOINT_VERSION,
+    DEFAULT_CHECKPOINT_EVERY, DEFAULT_ENCODING, STATE_DIR_NAME
+)
+
+RESUME_MESSAGE = 'Продолжаем {name} с контрольной точки: готово {done}'
+STALE_CHECKPOINT_MESSAGE = (
+    'Контрольная точка {path} относится к другому списку страниц, '
+    'начинаем заново'
+)
+
+
+def finished_outcomes(lines):
+    done = {}
+    for line in lines:
+        try:
+            batch = json.loads(line)
+        except ValueError:
+            break
+        for key, outcome in batch:
+            if outcome[-1] is None:
+                done[key] = tuple(outcome)
+    return done
+
+
+def read_journal(path, header):
+    try:
+        with open(path, encoding=DEFAULT_ENCODING) as file:
+            lines = file.read().splitlines()
+    except FileNotFoundError:
+        return None
+    try:
+        if json.loads(lines[0]) != header:
+            raise ValueError
+    except (IndexError, ValueError):
+        logging.warning(STALE_CHECKPOINT_MESSAGE.format(path=path))
+        return None
+    return finished_outcomes(lines[1:])
+
+
+class Journal:
+    def __init__(self, path, header, every, resume):
+        self.path = path
+        self.header = header
+        self.every = every
+        self.pending = []
+        self.file = None
+        done = read_journal(path, header) if resume else None
+        self.resumed = done is not None
+        self.done = done or {}
+
+    def record(self, key, outcome):
+        self.done[key] = outcome
+        if not self.every:
+            return
+        self.pending.append((key, outcome))
+        if len(self.pending) >= self.every:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        if self.file is None:
+            self.path.parent.mkdir(exist_ok=True)
+            self.file = open(
+                self.path, 'a' if self.resumed else 'w',
+                encoding=DEFAULT_ENCODING
+            )
+            if not self.resumed:
+                self.file.write(json.dumps(self.header) + '\n')
+        self.file.write(
+            json.dumps(self.pending, ensure_ascii=False) + '\n'
+        )
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.pending.clear()
+
+    def finish(self):
+        if self.file is not None:
+            self.file.close()
+        if self.every and self.path.exists():
+            self.path.unlink()
+
+
+def open_journal(cli_args, name, index):
+    resume = getattr(cli_args, 'resume', False)
+    every = getattr(cli_args, 'checkpoint_every', None)
+    if every is None:
+        every = DEFAULT_CHECKPOINT_EVERY if resume else 0
+    journal = Journal(
+        BASE_DIR / STATE_DIR_NAME / CHECKPOINT_FILE_NAME.format(name=name),
+        dict(version=CHECKPOINT_VERSION, name=name, index=index),
+        every,
+        resume
+    )
+    if journal.resumed:
+        logging.info(RESUME_MESSAGE.format(name=name, done=len(journal.done)))
+    return journal
@@ -1,21 +1,84 @@
 import argparse
 import logging
+from pathlib import Path
 import sys
 from logging.handlers import RotatingFileHandler
 
 from constants import (
-    BASE_DIR, LOG_DIR_NAME, LOG_FILE_NAME, FILE_OUTPUT_ARG, PRETTY_OUTPUT_ARG
+    ARCHIVE_FORMATS, BASE_DIR, BS4_ENGINE, COMPRESSED_CACHE_BACKEND,
+    CROSSCHECK_SOURCE, DEFAULT_ARCHIVE_FORMATS, DEFAULT_BACKOFF,
+    DEFAULT_CACHE_BACKEND, DEFAULT_CACHE_SIZE, DEFAULT_ENGINE,
+    DEFAULT_PARSE_WORKERS, DEFAULT_PEP_SOURCE, DEFAULT_POOL_SIZE, DEFAULT_RATE,
+    DEFAULT_RETRIES, DEFAULT_SEGMENTS, DEFAULT_SERVE_HOST, DEFAULT_SERVE_PORT,
+    DEFAULT_TIMEOUT, DEFAULT_WORKERS, EXTRACTION_CACHE_SIZE, FILE_OUTPUT_ARG,
+    HTML_SOURCE, INDEX_EXPIRE_AFTER, JSON_REPORT_ARG, JSON_SOURCE,
+    LOG_DIR_NAME, LOG_FILE_NAME, LXML_ENGINE, PAGE_EXPIRE_AFTER,
+    PRETTY_OUTPUT_ARG, PROMETHEUS_REPORT_ARG, RESULTS_EXPIRE_AFTER,
+    SNAPSHOT_FILE_NAME, SQLITE_CACHE_BACKEND, SQLITE_OUTPUT_ARG
 )
 from utils import build_dir
 
 LOG_FORMAT = '%(asctime)s - [%(levelname)s] - %(message)s'
 DT_FORMAT = '%d.%m.%Y %H:%M:%S'
+NOT_POSITIVE_MESSAGE = 'Ожидается целое число больше нуля, получено {value}'
+NOT_POSITIVE_FLOAT_MESSAGE = 'Ожидается число больше нуля, получено {value}'
+NEGATIVE_MESSAGE = 'Ожидается неотрицательное число, получено {value}'
+SHARD_MESSAGE = 'Ожидается часть в виде I/N, где 1 <= I <= N, получено {value}'
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            NOT_POSITIVE_MESSAGE.format(value=value)
+        )
+    return number
+
+
+def positive_float(value):
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(
+            NOT_POSITIVE_FLOAT_MESSAGE.format(value=value)
+        )
+    return number
+
+
+def non_negative(number_type):
+    def convert(value):
+        number = number_type(value)
+        if number < 0:
+            raise argparse.ArgumentTypeError(
+                NEGATIVE_MESSAGE.format(value=value)
+            )
+        return number
+    return convert
+
+
+def interval(value):
+    mode, _, seconds = value.rpartition('=')
+    return mode or None, positive_float(seconds)
+
+
+def shard(value):
+    index, _, count = value.partition('/')
+    index, count = positive_int(index), positive_int(count)
+    if index > count:
+        raise argparse.ArgumentTypeError(
+            SHARD_MESSAGE.format(value=value)
+        )
+    return index, count
+
+
+def mode_args(cli_args, mode):
+    return argparse.Namespace(**{**vars(cli_args), 'mode': mode})
 
 
 def configure_argument_parser(available_modes):
     parser = argparse.ArgumentParser(description='Парсер документации Python')
     parser.add_argument(
         'mode',
+        nargs='+',
         choices=available_modes,
         help='Режимы работы парсера'
     )
@@ -28,9 +91,178 @@ def configure_argument_parser(available_modes):
     parser.add_argument(
         '-o',
         '--output',
-        choices=(PRETTY_OUTPUT_ARG, FILE_OUTPUT_ARG),
+        choices=(PRETTY_OUTPUT_ARG, FILE_OUTPUT_ARG, SQLITE_OUTPUT_ARG),
         help='Дополнительные способы вывода данных'
     )
+    parser.add_argument(
+        '-w',
+        '--workers',
+        type=positive_int,
+        default=DEFAULT_WORKERS,
+        help='Количество параллельных загрузок страниц'
+    )
+    parser.add_argument(
+        '-p',
+        '--parse-workers',
+        type=positive_int,
+        default=DEFAULT_PARSE_WORKERS,
+        help='Количество процессов для разбора страниц'
+    )
+    parser.add_argument(
+        '-e',
+        '--engine',
+        choices=(BS4_ENGINE, LXML_ENGINE),
+        default=DEFAULT_ENGINE,
+        help='Движок извлечения данных из страниц'
+    )
+    parser.add_argument(
+        '-i',
+        '--incremental',
+        action='store_true',
+        help='Загружать только новые и изменившиеся PEP'
+    )
+    parser.add_argument(
+        '--shard',
+        type=shard,
+        help='Обработать только часть I из N ссылок на PEP'
+    )
+    parser.add_argument(
+        '--checkpoint-every',
+        type=positive_int,
+        help='Сохранять прогресс обхода каждые N страниц'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Продолжить обход с последней контрольной точки'
+    )
+    parser.add_argument(
+        '--source',
+        choices=(HTML_SOURCE, JSON_SOURCE, CROSSCHECK_SOURCE),
+        default=DEFAULT_PEP_SOURCE,
+        help='Источник статусов PEP'
+    )
+    parser.add_argument(
+        '--cache-backend',
+        choices=(SQLITE_CACHE_BACKEND, COMPRESSED_CACHE_BACKEND),
+        default=DEFAULT_CACHE_BACKEND,
+        help='Хранилище кеша HTTP-запросов'
+    )
+    parser.add_argument(
+        '--cache-size',
+        type=positive_float,
+        default=DEFAULT_CACHE_SIZE,
+        help='Наибольший размер сжатого кеша HTTP-запросов, МиБ'
+    )
+    parser.add_argument(
+        '--snapshot',
+        type=Path,
+        default=Path(SNAPSHOT_FILE_NAME),
+        help='Файл снимка кеша для cache-export и cache-import'
+    )
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Работать только с кешем, без запросов в сеть'
+    )
+    parser.add_argument(
+        '--index-ttl',
+        type=positive_int,
+        default=INDEX_EXPIRE_AFTER,
+        help='Время жизни кеша индексных страниц, секунд'
+    )
+    parser.add_argument(
+        '--page-ttl',
+        type=positive_int,
+        default=PAGE_EXPIRE_AFTER,
+        help='Время жизни кеша страниц PEP и статей, секунд'
+    )
+    parser.add_argument(
+        '--extraction-cache-size',
+        type=non_negative(int),
+        default=EXTRACTION_CACHE_SIZE,
+        help='Сколько страниц хранить в кеше извлечённых данных, 0 - без кеша'
+    )
+    parser.add_argument(
+        '-f',
+        '--formats',
+        nargs='+',
+        choices=tuple(ARCHIVE_FORMATS),
+        default=DEFAULT_ARCHIVE_FORMATS,
+        help='Форматы архивов документации для загрузки'
+    )
+    parser.add_argument(
+        '-s',
+        '--segments',
+        type=positive_int,
+        default=DEFAULT_SEGMENTS,
+        help='Количество параллельных частей при загрузке архива'
+    )
+    parser.add_argument(
+        '--pool-size',
+        type=positive_int,
+        default=DEFAULT_POOL_SIZE,
+        help='Количество соединений с одним хостом'
+    )
+    parser.add_argument(
+        '--rate',
+        type=positive_float,
+        default=DEFAULT_RATE,
+        help='Наибольшее число запросов к одному хосту в секунду'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=positive_float,
+        default=DEFAULT_TIMEOUT,
+        help='Таймаут запроса, секунд'
+    )
+    parser.add_argument(
+        '--retries',
+        type=non_negative(int),
+        default=DEFAULT_RETRIES,
+        help='Количество повторов запроса при сбое'
+    )
+    parser.add_argument(
+        '--backoff',
+        type=non_negative(float),
+        default=DEFAULT_BACKOFF,
+        help='Базовая пауза между повторами, секунд'
+    )
+    parser.add_argument(
+        '--interval',
+        nargs='+',
+        type=interval,
+        default=(),
+        help='Интервалы наблюдения: СЕКУНД или РЕЖИМ=СЕКУНД'
+    )
+    parser.add_argument(
+        '--host',
+        default=DEFAULT_SERVE_HOST,
+        help='Адрес, на котором работает API'
+    )
+    parser.add_argument(
+        '--port',
+        type=non_negative(int),
+        default=DEFAULT_SERVE_PORT,
+        help='Порт, на котором работает API'
+    )
+    parser.add_argument(
+        '--results-ttl',
+        type=positive_float,
+        default=RESULTS_EXPIRE_AFTER,
+        help='Время жизни результатов в памяти API, секунд'
+    )
+    parser.add_argument(
+        '-r',
+        '--report',
+        choices=(JSON_REPORT_ARG, PROMETHEUS_REPORT_ARG),
+        help='Сохранить отчёт о времени работы этапов'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Сохранить профиль cProfile режима работы'
+    )
     return parser
 
 
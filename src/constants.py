@@ -3,22 +3,144 @@ from urllib.parse import urljoin
 
 BASE_DIR = Path(__file__).parent
 DOWNLOADS_DIR_NAME = 'downloads'
+DOWNLOADS_MANIFEST_FILE_NAME = 'downloads_manifest.json'
 RESULTS_DIR_NAME = 'results'
 LOG_DIR_NAME = 'logs'
 LOG_FILE_NAME = 'parser.log'
+REPORTS_DIR_NAME = 'reports'
+STATE_DIR_NAME = 'state'
+PEP_STATE_FILE_NAME = 'pep.json'
+EXTRACTION_CACHE_FILE_NAME = 'extracted.sqlite3'
+STATE_VERSION = 1
+SHARDS_DIR_NAME = 'shards'
+SHARD_FILE_NAME = 'pep_shard_{index}_of_{count}.json'
+SHARD_FILE_PATTERN = 'pep_shard_*_of_*.json'
+SHARD_VERSION = 1
+CHECKPOINT_FILE_NAME = 'checkpoint_{name}.jsonl'
+CHECKPOINT_VERSION = 1
 
 
+ALL_MODES_ARG = 'all'
+WATCH_COMMAND = 'watch'
+SERVE_COMMAND = 'serve'
+CACHE_STATS_COMMAND = 'cache-stats'
+CACHE_EXPORT_COMMAND = 'cache-export'
+CACHE_IMPORT_COMMAND = 'cache-import'
+MERGE_COMMAND = 'merge'
 PRETTY_OUTPUT_ARG = 'pretty'
 FILE_OUTPUT_ARG = 'file'
+SQLITE_OUTPUT_ARG = 'sqlite'
+
+DATABASE_FILE_NAME = 'results.sqlite3'
+SQLITE_BATCH_SIZE = 500
+TOTAL_ROW_LABEL = 'Всего'
 
 DATETIME_FORMAT = '%Y-%m-%d_%H-%M-%S'
 
+JSON_REPORT_ARG = 'json'
+PROMETHEUS_REPORT_ARG = 'prometheus'
+REPORT_FILE_NAMES = {
+    JSON_REPORT_ARG: 'report_{mode}_{now}.json',
+    PROMETHEUS_REPORT_ARG: 'parser_{mode}.prom',
+}
+PROFILE_FILE_NAME = 'profile_{mode}_{now}.prof'
+LATENCY_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+
 DEFAULT_ENCODING = 'utf-8'
 DEFAULT_FEATURE = 'lxml'
+BS4_ENGINE = 'bs4'
+LXML_ENGINE = 'lxml'
+DEFAULT_ENGINE = BS4_ENGINE
+
+DEFAULT_WORKERS = 8
+DEFAULT_PARSE_WORKERS = 1
+PARSE_START_METHOD = 'spawn'
+PARSE_QUEUE_FACTOR = 4
 
 MAIN_DOC_URL = 'https://docs.python.org/3/'
 MAIN_PEPS_URL = 'https://peps.python.org/'
 DOWNLOAD_URL = urljoin(MAIN_DOC_URL, 'download.html')
+WHATS_NEW_URL = urljoin(MAIN_DOC_URL, 'whatsnew/')
+PEPS_JSON_URL = urljoin(MAIN_PEPS_URL, 'api/peps.json')
+INDEX_URLS = (
+    MAIN_DOC_URL, MAIN_PEPS_URL, DOWNLOAD_URL, WHATS_NEW_URL, PEPS_JSON_URL
+)
+
+HTML_SOURCE = 'html'
+JSON_SOURCE = 'json'
+CROSSCHECK_SOURCE = 'crosscheck'
+DEFAULT_PEP_SOURCE = JSON_SOURCE
+
+ARCHIVE_FORMATS = {
+    'pdf-a4': 'pdf-a4.zip',
+    'pdf-letter': 'pdf-letter.zip',
+    'html': 'html.zip',
+    'text': 'text.zip',
+    'texinfo': 'texinfo.zip',
+    'epub': '.epub',
+}
+DEFAULT_ARCHIVE_FORMATS = ('pdf-a4',)
+DEFAULT_SEGMENTS = 1
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+PART_SUFFIX = '.part'
+PART_VALIDATOR_SUFFIX = '.part.json'
+NO_STORE_HEADERS = {
+    'Cache-Control': 'no-store',
+    'Accept-Encoding': 'identity'
+}
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+RETRY_JITTER = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_METHODS = frozenset(('GET', 'HEAD'))
+
+DEFAULT_RATE = 10.0
+MIN_RATE = 0.5
+RATE_STEP = 0.5
+RATE_BACKOFF = 0.5
+INITIAL_CONCURRENCY = 4
+CONCURRENCY_BACKOFF = 0.5
+LATENCY_SMOOTHING = 0.2
+LATENCY_TOLERANCE = 2.0
+LATENCY_WINDOW = 50
+THROTTLE_STATUSES = (429, 503)
+
+DEFAULT_WATCH_INTERVAL = 60 * 60
+WATCH_TICK = 1.0
+DEFAULT_CHECKPOINT_EVERY = 50
+SERVED_MODES = ('whats-new', 'latest-versions', 'pep')
+DEFAULT_SERVE_HOST = '127.0.0.1'
+DEFAULT_SERVE_PORT = 8000
+RESULTS_EXPIRE_AFTER = 5 * 60
+FIRST_RESULTS_TIMEOUT = 60.0
+
+CACHE_NAME = 'http_cache'
+SNAPSHOT_FILE_NAME = 'cache_snapshot.tar.gz'
+SNAPSHOT_MANIFEST_NAME = 'manifest.json'
+SNAPSHOT_VERSION = 1
+NOT_CACHED_STATUS = 504
+SQLITE_CACHE_BACKEND = 'sqlite'
+COMPRESSED_CACHE_BACKEND = 'compressed'
+DEFAULT_CACHE_BACKEND = COMPRESSED_CACHE_BACKEND
+MEBIBYTE = 1024 * 1024
+DEFAULT_CACHE_SIZE = 100
+CACHE_COMPRESSION_LEVEL = 6
+CACHE_EVICT_TARGET = 0.9
+CACHE_TOUCH_BATCH = 100
+MAX_CACHED_BODY = 5 * MEBIBYTE
+CACHEABLE_CONTENT_TYPES = (
+    'text/', 'application/json', 'application/xml', 'application/xhtml+xml'
+)
+
+INDEX_EXPIRE_AFTER = 15 * 60
+PAGE_EXPIRE_AFTER = 7 * 24 * 60 * 60
+EXTRACTION_CACHE_SIZE = 50000
+EXTRACTION_LIBRARIES = ('beautifulsoup4', 'lxml')
 
 EXPECTED_STATUS = {
     'A': ('Active', 'Accepted'),
@@ -0,0 +1,237 @@
+from functools import partial
+import hashlib
+import logging
+import os
+from threading import Lock
+import time
+
+from constants import (
+    DOWNLOAD_CHUNK_SIZE, MEBIBYTE, NO_STORE_HEADERS, PART_SUFFIX,
+    PART_VALIDATOR_SUFFIX
+)
+from exceptions import ParserDownloadException
+from state import load_json, save_json
+from utils import map_concurrently
+
+RESUME_MESSAGE = 'Продолжаем загрузку {url} с {offset} байта'
+RESTART_MESSAGE = (
+    'Сервер не поддерживает докачку {url} или файл изменился, '
+    'загружаем заново'
+)
+NO_VALIDATOR_MESSAGE = (
+    'Нельзя проверить, что {url} не изменился с прошлой загрузки, '
+    'загружаем заново'
+)
+SIZE_MISMATCH_MESSAGE = (
+    'Размер файла {path} ({size} байт) не совпадает '
+    'с ожидаемым ({expected} байт)'
+)
+NO_RANGES_MESSAGE = 'Сервер не вернул запрошенный диапазон байт {url}'
+SEGMENT_MISMATCH_MESSAGE = (
+    'Сегмент {start}-{end} файла {url} загружен не полностью: {size} байт'
+)
+THROUGHPUT_MESSAGE = (
+    'Загружено {size:.1f} МиБ за {seconds:.1f} с ({speed:.1f} МиБ/с), '
+    'файлов: {files}, сегментов на файл: {segments}'
+)
+UNCHANGED_MESSAGE = 'Файл {path} не изменился на сервере, загрузка пропущена'
+PARTIAL_CONTENT = 206
+RANGE_NOT_SATISFIABLE = 416
+
+
+def expected_size(response, offset):
+    if response.status_code == PARTIAL_CONTENT:
+        total = response.headers.get('Content-Range', '').rpartition('/')[2]
+        if total.isdigit():
+            return int(total)
+    length = response.headers.get('Content-Length')
+    if length is None or not length.isdigit():
+        return None
+    return int(length) + offset
+
+
+def check_size(path, expected):
+    size = path.stat().st_size
+    if expected is None or size == expected:
+        return
+    if size > expected:
+        path.unlink()
+    raise ParserDownloadException(
+        SIZE_MISMATCH_MESSAGE.format(path=path, size=size, expected=expected)
+    )
+
+
+def part_validator(response):
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.headers.get('Last-Modified')
+
+
+def download_file(session, url, path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    part_path = path.with_name(path.name + PART_SUFFIX)
+    validator_path = path.with_name(path.name + PART_VALIDATOR_SUFFIX)
+    validator = load_json(validator_path).get('validator')
+    offset = part_path.stat().st_size if part_path.exists() else 0
+    headers = dict(NO_STORE_HEADERS)
+    if offset and validator:
+        headers.update({'Range': f'bytes={offset}-', 'If-Range': validator})
+        logging.info(RESUME_MESSAGE.format(url=url, offset=offset))
+    elif offset:
+        logging.info(NO_VALIDATOR_MESSAGE.format(url=url))
+        offset = 0
+    with session.get(url, headers=headers, stream=True) as response:
+        if response.status_code == RANGE_NOT_SATISFIABLE:
+            part_path.unlink()
+            return download_file(session, url, path, chunk_size)
+        response.raise_for_status()
+        if offset and response.status_code != PARTIAL_CONTENT:
+            logging.info(RESTART_MESSAGE.format(url=url))
+            offset = 0
+        expected = expected_size(response, offset)
+        if not offset:
+            save_json(
+                validator_path, dict(validator=part_validator(response))
+            )
+        with open(part_path, 'ab' if offset else 'wb') as file:
+            for chunk in response.iter_content(chunk_size):
+                file.write(chunk)
+    check_size(part_path, expected)
+    os.replace(part_path, path)
+    validator_path.unlink()
+    return path
+
+
+def file_sha256(path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def remote_metadata(session, url):
+    response = session.head(
+        url, headers=NO_STORE_HEADERS, allow_redirects=True
+    )
+    response.raise_for_status()
+    size = response.headers.get('Content-Length', '')
+    return dict(
+        url=url,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified'),
+        size=int(size) if size.isdigit() else None,
+        ranges=response.headers.get('Accept-Ranges') == 'bytes'
+    )
+
+
+def is_unchanged(entry, metadata, path):
+    if not entry or entry['url'] != metadata['url'] or not path.exists():
+        return False
+    if not (metadata['etag'] or metadata['last_modified']):
+        return False
+    if (
+        entry['etag'] != metadata['etag']
+        or entry['last_modified'] != metadata['last_modified']
+        or path.stat().st_size != entry['size']
+    ):
+        return False
+    return file_sha256(path) == entry['sha256']
+
+
+def segment_bounds(size, segments):
+    step = -(-size // segments)
+    return [
+        (start, min(start + step, size) - 1)
+        for start in range(0, size, step)
+    ]
+
+
+def download_segment(session, url, part_path, bounds,
+                     chunk_size=DOWNLOAD_CHUNK_SIZE):
+    start, end = bounds
+    headers = dict(NO_STORE_HEADERS, Range=f'bytes={start}-{end}')
+    with session.get(url, headers=headers, stream=True) as response:
+        response.raise_for_status()
+        if response.status_code != PARTIAL_CONTENT:
+            raise ParserDownloadException(
+                NO_RANGES_MESSAGE.format(url=url)
+            )
+        with open(part_path, 'r+b') as file:
+            file.seek(start)
+            for chunk in response.iter_content(chunk_size):
+                file.write(chunk)
+            written = file.tell() - start
+    if written != end - start + 1:
+        raise ParserDownloadException(SEGMENT_MISMATCH_MESSAGE.format(
+            url=url, start=start, end=end, size=written
+        ))
+
+
+def download_segmented(session, url, path, size, segments):
+    part_path = path.with_name(path.name + PART_SUFFIX)
+    with open(part_path, 'wb') as file:
+        file.truncate(size)
+    try:
+        for _ in map_concurrently(
+            partial(download_segment, session, url, part_path),
+            segment_bounds(size, segments),
+            segments
+        ):
+            pass
+    except Exception:
+        part_path.unlink()
+        raise
+    check_size(part_path, size)
+    os.replace(part_path, path)
+    return path
+
+
+def sync_file(session, target, entry=None, segments=1):
+    url, path = target
+    metadata = remote_metadata(session, url)
+    if is_unchanged(entry, metadata, path):
+        logging.info(UNCHANGED_MESSAGE.format(path=path))
+        return entry, 0
+    if segments > 1 and metadata['ranges'] and metadata['size']:
+        download_segmented(session, url, path, metadata['size'], segments)
+    else:
+        download_file(session, url, path)
+    size = path.stat().st_size
+    return dict(metadata, size=size, sha256=file_sha256(path)), size
+
+
+def sync_files(session, targets, manifest_path, workers=1, segments=1):
+    manifest = load_json(manifest_path)
+    manifest_lock = Lock()
+
+    def sync(target):
+        name = target[1].name
+        try:
+            entry, size = sync_file(
+                session, target, manifest.get(name), segments
+            )
+        except Exception as error:
+            return 0, error
+        with manifest_lock:
+            manifest[name] = entry
+        return size, None
+
+    started = time.monotonic()
+    try:
+        results = list(map_concurrently(sync, targets, workers))
+    finally:
+        save_json(manifest_path, manifest)
+    for _, error in results:
+        if error is not None:
+            raise error
+    downloaded = sum(size for size, _ in results)
+    elapsed = time.monotonic() - started
+    logging.info(THROUGHPUT_MESSAGE.format(
+        size=downloaded / MEBIBYTE,
+        seconds=elapsed,
+        speed=downloaded / MEBIBYTE / elapsed if elapsed else 0,
+        files=len(targets),
+        segments=segments
+    ))
+    return [path for _, path in targets]
@@ -1,2 +1,14 @@
 class ParserFindTagException(Exception):
     """Вызывается, когда парсер не может найти тег."""
+
+
+class ParserDownloadException(Exception):
+    """Вызывается, когда загруженный файл не совпадает с ожидаемым."""
+
+
+class ParserSnapshotException(Exception):
+    """Вызывается, когда снимок кеша повреждён или несовместим."""
+
+
+class ParserShardException(Exception):
+    """Вызывается, когда части прогона нельзя объединить."""
@@ -0,0 +1,176 @@
+import json
+from urllib.parse import urljoin
+
+from bs4 import SoupStrainer
+from lxml.etree import XPath
+
+from constants import (
+    ARCHIVE_FORMATS, BS4_ENGINE, DOWNLOAD_URL, LXML_ENGINE, MAIN_PEPS_URL,
+    WHATS_NEW_URL
+)
+from utils import find_node, find_tag, fingerprint, make_soup, make_tree
+
+PEP_INDEX_STRAINER = SoupStrainer(
+    'table', attrs={'class': 'pep-zero-table docutils align-default'}
+)
+PEP_PAGE_STRAINER = SoupStrainer('dl')
+WHATS_NEW_INDEX_STRAINER = SoupStrainer(
+    'section', attrs={'id': 'what-s-new-in-python'}
+)
+WHATS_NEW_PAGE_STRAINER = SoupStrainer(['h1', 'dl'])
+SIDEBAR_STRAINER = SoupStrainer(
+    'div', attrs={'class': 'sphinxsidebarwrapper'}
+)
+DOWNLOAD_STRAINER = SoupStrainer('table', attrs={'class': 'docutils'})
+
+FIRST_DL_XPATH = XPath('(//dl)[1]')
+STATUS_VALUE_XPATH = XPath(
+    'descendant::text()[. = "Status"][1]/../following-sibling::*[1]'
+)
+FIRST_H1_XPATH = XPath('(//h1)[1]')
+TEXT_XPATH = XPath(
+    'descendant::text()'
+    '[not(ancestor::script or ancestor::style or ancestor::template)]'
+)
+SIDEBAR_XPATH = XPath(
+    '(//div[contains(concat(" ", normalize-space(@class), " "), '
+    '" sphinxsidebarwrapper ")])[1]'
+)
+FIRST_UL_XPATH = XPath('(descendant::ul)[1]')
+LINKS_XPATH = XPath('descendant::a')
+
+
+def extract_pep_index(html):
+    rows = []
+    peps_with_no_preview = []
+    all_tables = make_soup(html, parse_only=PEP_INDEX_STRAINER).find_all(
+        'table',
+        attrs={'class': 'pep-zero-table docutils align-default'}
+    )
+    for current_table in all_tables:
+        table_body = find_tag(current_table, 'tbody')
+        for current_row in table_body.find_all('tr'):
+            try:
+                preview_status = current_row.find('abbr').text[1:]
+            except AttributeError:
+                preview_status = ''
+                peps_with_no_preview.append(
+                    current_row.find(
+                        attrs={'class': 'pep reference internal'}
+                    ).text
+                )
+            pep_link = urljoin(
+                MAIN_PEPS_URL,
+                find_tag(
+                    current_row,
+                    'a',
+                    attrs={'class': 'pep reference internal'}
+                )['href']
+            )
+            rows.append(
+                (preview_status, pep_link, fingerprint(str(current_row)))
+            )
+    return rows, peps_with_no_preview
+
+
+def extract_whats_new_links(html):
+    return [
+        urljoin(WHATS_NEW_URL, tag['href'])
+        for tag in make_soup(
+            html, parse_only=WHATS_NEW_INDEX_STRAINER
+        ).select(
+            '#what-s-new-in-python div.toctree-wrapper '
+            'li.toctree-l1 > a.reference'
+        )
+    ]
+
+
+def extract_archive_links(html):
+    soup = make_soup(html, parse_only=DOWNLOAD_STRAINER)
+    archive_links = {}
+    for format, suffix in ARCHIVE_FORMATS.items():
+        a_tag = soup.select_one(f'table.docutils td > [href*="{suffix}"]')
+        if a_tag is not None:
+            archive_links[format] = urljoin(DOWNLOAD_URL, a_tag['href'])
+    return archive_links
+
+
+def extract_pep_status(html):
+    main_dl = find_tag(make_soup(html, parse_only=PEP_PAGE_STRAINER), 'dl')
+    pre_status_section = main_dl.find(string='Status').parent
+    status = pre_status_section.find_next_sibling().string
+    return None if status is None else str(status)
+
+
+def extract_whats_new(html):
+    soup = make_soup(html, parse_only=WHATS_NEW_PAGE_STRAINER)
+    return (
+        find_tag(soup, 'h1').text,
+        find_tag(soup, 'dl').text.replace('\n', ' ')
+    )
+
+
+def extract_version_links(html):
+    sidebar = find_tag(
+        make_soup(html, parse_only=SIDEBAR_STRAINER),
+        'div',
+        attrs={'class': 'sphinxsidebarwrapper'}
+    )
+    return [
+        (a_tag['href'], a_tag.text)
+        for a_tag in sidebar.find('ul').find_all('a')
+    ]
+
+
+def node_string(node):
+    while True:
+        children = list(node)
+        if not children:
+            return node.text
+        if len(children) > 1 or node.text or children[0].tail:
+            return None
+        node = children[0]
+
+
+def node_text(node):
+    return ''.join(TEXT_XPATH(node))
+
+
+def xpath_pep_status(html):
+    main_dl = find_node(make_tree(html), FIRST_DL_XPATH)
+    status = node_string(find_node(main_dl, STATUS_VALUE_XPATH))
+    return None if status is None else str(status)
+
+
+def xpath_whats_new(html):
+    tree = make_tree(html)
+    return (
+        node_text(find_node(tree, FIRST_H1_XPATH)),
+        node_text(find_node(tree, FIRST_DL_XPATH)).replace('\n', ' ')
+    )
+
+
+def xpath_version_links(html):
+    sidebar = find_node(make_tree(html), SIDEBAR_XPATH)
+    return [
+        (a_tag.attrib['href'], node_text(a_tag))
+        for a_tag in LINKS_XPATH(find_node(sidebar, FIRST_UL_XPATH))
+    ]
+
+
+def extract_json_statuses(text):
+    return {pep['url']: pep['status'] for pep in json.loads(text).values()}
+
+
+PEP_STATUS_EXTRACTORS = {
+    BS4_ENGINE: extract_pep_status,
+    LXML_ENGINE: xpath_pep_status
+}
+WHATS_NEW_EXTRACTORS = {
+    BS4_ENGINE: extract_whats_new,
+    LXML_ENGINE: xpath_whats_new
+}
+VERSION_LINKS_EXTRACTORS = {
+    BS4_ENGINE: extract_version_links,
+    LXML_ENGINE: xpath_version_links
+}
@@ -1,20 +1,34 @@
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import datetime as dt
 import logging
 import re
-from urllib.parse import urljoin
+from threading import Lock
 
-import requests_cache
-from tqdm import tqdm
-
-from configs import configure_argument_parser, configure_logging
+from configs import configure_argument_parser, configure_logging, mode_args
 from constants import (
-    BASE_DIR, DOWNLOADS_DIR_NAME, EXPECTED_STATUS,
-    DOWNLOAD_URL, MAIN_DOC_URL, MAIN_PEPS_URL
+    ALL_MODES_ARG, BASE_DIR, CACHE_EXPORT_COMMAND, CACHE_IMPORT_COMMAND,
+    CACHE_STATS_COMMAND, CROSSCHECK_SOURCE, DATETIME_FORMAT,
+    DEFAULT_ARCHIVE_FORMATS, DEFAULT_ENGINE, DEFAULT_PARSE_WORKERS,
+    DEFAULT_PEP_SOURCE, DEFAULT_SEGMENTS, DEFAULT_WORKERS,
+    DOWNLOADS_DIR_NAME, DOWNLOADS_MANIFEST_FILE_NAME, DOWNLOAD_URL,
+    EXPECTED_STATUS, HTML_SOURCE, JSON_SOURCE, MAIN_DOC_URL, MAIN_PEPS_URL,
+    MERGE_COMMAND, PEPS_JSON_URL, PEP_STATE_FILE_NAME, PROFILE_FILE_NAME,
+    REPORTS_DIR_NAME, REPORT_FILE_NAMES, SERVE_COMMAND, SERVED_MODES,
+    SHARDS_DIR_NAME, STATE_DIR_NAME, STATE_VERSION, TOTAL_ROW_LABEL,
+    WATCH_COMMAND, WHATS_NEW_URL
+)
+from metrics import log_summary, profile_call, write_report
+from state import load_json, save_json
+from throttling import limits_postfix, limits_snapshot
+from utils import (
+    CACHE_STATS, build_dir, extract_pages, fingerprint, parse_page
 )
-from outputs import control_output
-from utils import build_dir, find_tag, prepare_soup, REQUEST_ERROR
 
 WHERE_IS_ARCHIVE_MESSAGE = 'Архив загружен. Путь: {path}'
+MISSING_ARCHIVE_MESSAGE = (
+    'На странице {url} нет архива в формате {format}, есть: {found}'
+)
 START_PARSING_MESSAGE = 'Парсер запущен!'
 STOP_PARSING_MESSAGE = 'Парсер завершил работу!'
 CLI_ARGS_MESSAGE = 'Аргументы командной строки: {args}'
@@ -25,120 +39,335 @@ NON_MATCHING_STATUSES_MESSAGE = (
     'Статус в карточке: {}\n'
     'Ожидаемые статусы: {}'
 )
+INCREMENTAL_MESSAGE = 'Изменившихся PEP: {changed} из {total}'
+JSON_FALLBACK_MESSAGE = (
+    'Не удалось получить статусы из {url}, загружаем страницы PEP. '
+    'Ошибка: {err}'
+)
+MISSING_IN_JSON_MESSAGE = (
+    'PEP нет в {url}, загружаем их страницы: {peps}'
+)
+DISAGREEMENT_MESSAGE = (
+    'Статусы расходятся: {link}\n'
+    'Статус на странице: {html_status}\n'
+    'Статус в {url}: {json_status}'
+)
+CROSSCHECK_MESSAGE = 'Расхождений между страницами PEP и {url}: {count}'
+CACHE_STATS_MESSAGE = (
+    'Кеш: попаданий {hit}, подтверждено сервером {revalidated}, '
+    'промахов {miss}'
+)
+LIMITS_MESSAGE = (
+    'Хост {host}: {rate} запросов/с, одновременно {concurrency}, '
+    'задержка {latency_ms} мс, замедлений {throttled}'
+)
+MODE_ERROR_MESSAGE = 'Сбой в режиме {mode}. Ошибка: {err}'
 ERROR_MESSAGE = 'Сбой в работе программы. Ошибка: {err}'
+COMMAND_POSITION_MESSAGE = 'Команда {command} должна идти первой'
+SHARD_MODE_MESSAGE = 'Опция --shard работает только с режимом pep'
+UNKNOWN_INTERVAL_MODE_MESSAGE = 'Интервал задан для неизвестного режима {mode}'
+NOTHING_TO_SERVE_MESSAGE = (
+    'Режимы {modes} не отдают таблицу, serve работает с режимами {served}'
+)
+
+
+def track_progress(items, total):
+    from tqdm import tqdm
+
+    progress = tqdm(items, total=total)
+    for item in progress:
+        progress.set_postfix_str(limits_postfix(), refresh=False)
+        yield item
 
 
-def whats_new(session):
-    whats_new_url = urljoin(MAIN_DOC_URL, 'whatsnew/')
-    all_a_tags = prepare_soup(session, whats_new_url).select(
-        '#what-s-new-in-python div.toctree-wrapper li.toctree-l1 > a.reference'
+def whats_new(session, cli_args=None):
+    from checkpoints import open_journal
+    from extractors import WHATS_NEW_EXTRACTORS, extract_whats_new_links
+    from memo import open_extraction_cache
+
+    version_links = parse_page(
+        session, WHATS_NEW_URL, extract_whats_new_links
+    )
+    journal = open_journal(
+        cli_args, 'whats_new', fingerprint('\n'.join(version_links))
     )
-    results = [('Ссылка на статью', 'Заголовок', 'Редактор, автор')]
+    yield ('Ссылка на статью', 'Заголовок', 'Редактор, автор')
     error_requests = []
-    for tag in tqdm(all_a_tags):
-        version_link = urljoin(whats_new_url, tag['href'])
-        try:
-            soup = prepare_soup(session, version_link)
-        except ConnectionError as err:
-            error_requests.append(
-                REQUEST_ERROR.format(url=version_link, err=err)
-            )
-            continue
-        results.append(
-            (
-                version_link,
-                find_tag(soup, 'h1').text,
-                find_tag(soup, 'dl').text.replace('\n', ' ')
-            )
-        )
+    pending_links = []
+    for version_link in version_links:
+        if version_link in journal.done:
+            yield (version_link, *journal.done[version_link][0])
+        else:
+            pending_links.append(version_link)
+    pages = extract_pages(
+        session,
+        pending_links,
+        WHATS_NEW_EXTRACTORS[getattr(cli_args, 'engine', DEFAULT_ENGINE)],
+        getattr(cli_args, 'workers', DEFAULT_WORKERS),
+        getattr(cli_args, 'parse_workers', DEFAULT_PARSE_WORKERS),
+        open_extraction_cache(cli_args)
+    )
+    try:
+        for version_link, (extracted, error) in track_progress(
+            zip(pending_links, pages), len(pending_links)
+        ):
+            journal.record(version_link, (extracted, error))
+            if error is not None:
+                error_requests.append(error)
+                continue
+            yield (version_link, *extracted)
+    finally:
+        journal.flush()
     for error in error_requests:
         logging.error(error)
-    return results
+    journal.finish()
+
 
+def latest_versions(session, cli_args=None):
+    from extractors import VERSION_LINKS_EXTRACTORS
 
-def latest_versions(session):
-    sidebar = find_tag(
-        prepare_soup(session, MAIN_DOC_URL),
-        'div',
-        attrs={'class': 'sphinxsidebarwrapper'}
+    version_links = parse_page(
+        session,
+        MAIN_DOC_URL,
+        VERSION_LINKS_EXTRACTORS[getattr(cli_args, 'engine', DEFAULT_ENGINE)]
     )
-    ul_tag = sidebar.find('ul')
-    a_tags = ul_tag.find_all('a')
-    results = [('Ссылка на документацию', 'Версия', 'Статус')]
+    yield ('Ссылка на документацию', 'Версия', 'Статус')
     pattern = r'Python (?P<version>\d\.\d+) \((?P<status>.*)\)'
-    for a_tag in a_tags:
-        text_match = re.search(pattern, a_tag.text)
+    for link, text in version_links:
+        text_match = re.search(pattern, text)
         if text_match is not None:
             version, status = text_match.groups()
         else:
-            version, status = a_tag.text, ''
-        results.append(
-            (a_tag['href'], version, status)
+            version, status = text, ''
+        yield (link, version, status)
+
+
+def download(session, cli_args=None):
+    from downloads import sync_files
+    from extractors import extract_archive_links
+
+    archive_links = parse_page(session, DOWNLOAD_URL, extract_archive_links)
+    dir = build_dir(BASE_DIR, DOWNLOADS_DIR_NAME)
+    archive_urls = []
+    for format in getattr(cli_args, 'formats', DEFAULT_ARCHIVE_FORMATS):
+        if format not in archive_links:
+            logging.warning(MISSING_ARCHIVE_MESSAGE.format(
+                format=format, url=DOWNLOAD_URL, found=sorted(archive_links)
+            ))
+            continue
+        archive_urls.append(archive_links[format])
+    archive_paths = sync_files(
+        session,
+        [(url, dir / url.split('/')[-1]) for url in archive_urls],
+        BASE_DIR / DOWNLOADS_MANIFEST_FILE_NAME,
+        getattr(cli_args, 'workers', DEFAULT_WORKERS),
+        getattr(cli_args, 'segments', DEFAULT_SEGMENTS)
+    )
+    for archive_path in archive_paths:
+        logging.info(WHERE_IS_ARCHIVE_MESSAGE.format(path=archive_path))
+
+
+def pep_index_rows(session):
+    from extractors import extract_pep_index
+
+    return parse_page(session, MAIN_PEPS_URL, extract_pep_index)
+
+
+def fetch_pep_statuses(session, rows, cli_args):
+    from extractors import PEP_STATUS_EXTRACTORS
+    from memo import open_extraction_cache
+
+    return extract_pages(
+        session,
+        [pep_link for _, pep_link, _ in rows],
+        PEP_STATUS_EXTRACTORS[getattr(cli_args, 'engine', DEFAULT_ENGINE)],
+        getattr(cli_args, 'workers', DEFAULT_WORKERS),
+        getattr(cli_args, 'parse_workers', DEFAULT_PARSE_WORKERS),
+        open_extraction_cache(cli_args)
+    )
+
+
+def load_known_peps(state_path):
+    state = load_json(state_path)
+    return state['peps'] if state.get('version') == STATE_VERSION else {}
+
+
+def save_known_peps(state_path, peps):
+    links = {pep['link'] for pep in peps.values()}
+    save_json(state_path, {'version': STATE_VERSION, 'peps': {
+        **{
+            row: pep for row, pep in load_known_peps(state_path).items()
+            if pep['link'] not in links
+        },
+        **peps
+    }})
+
+
+def incremental_pep_statuses(session, rows, cli_args):
+    from extractors import PEP_STATUS_EXTRACTORS
+    from memo import open_extraction_cache
+
+    state_path = BASE_DIR / STATE_DIR_NAME / PEP_STATE_FILE_NAME
+    known = load_known_peps(state_path)
+    changed_links = list(dict.fromkeys(
+        pep_link for _, pep_link, row in rows if row not in known
+    ))
+    logging.info(INCREMENTAL_MESSAGE.format(
+        changed=len(changed_links), total=len(rows)
+    ))
+    fetched = dict(zip(changed_links, extract_pages(
+        session,
+        changed_links,
+        PEP_STATUS_EXTRACTORS[getattr(cli_args, 'engine', DEFAULT_ENGINE)],
+        getattr(cli_args, 'workers', DEFAULT_WORKERS),
+        getattr(cli_args, 'parse_workers', DEFAULT_PARSE_WORKERS),
+        open_extraction_cache(cli_args)
+    )))
+    peps = {}
+    statuses = []
+    for preview_status, pep_link, row in rows:
+        if row in known:
+            peps[row] = known[row]
+            statuses.append((known[row]['status'], None))
+            continue
+        status, error = fetched[pep_link]
+        if error is not None:
+            statuses.append((None, error))
+            continue
+        peps[row] = dict(
+            link=pep_link, preview_status=preview_status, status=status
         )
-    return results
+        statuses.append((status, None))
+    save_known_peps(state_path, peps)
+    return statuses
+
 
+def html_pep_statuses(session, rows, cli_args):
+    if getattr(cli_args, 'incremental', False):
+        return incremental_pep_statuses(session, rows, cli_args)
+    return fetch_pep_statuses(session, rows, cli_args)
 
-def download(session):
-    soup = prepare_soup(session, DOWNLOAD_URL)
-    archive_url = urljoin(
-        DOWNLOAD_URL,
-        soup.select_one('table.docutils td > [href*="pdf-a4.zip"]')['href']
+
+def load_json_statuses(session):
+    from extractors import extract_json_statuses
+
+    return parse_page(session, PEPS_JSON_URL, extract_json_statuses)
+
+
+def json_pep_statuses(session, rows, cli_args):
+    try:
+        json_statuses = load_json_statuses(session)
+    except (ConnectionError, ValueError, KeyError) as err:
+        logging.warning(
+            JSON_FALLBACK_MESSAGE.format(url=PEPS_JSON_URL, err=err)
+        )
+        return html_pep_statuses(session, rows, cli_args)
+    missing_rows = [row for row in rows if row[1] not in json_statuses]
+    if missing_rows:
+        logging.warning(MISSING_IN_JSON_MESSAGE.format(
+            url=PEPS_JSON_URL,
+            peps=[pep_link for _, pep_link, _ in missing_rows]
+        ))
+    fetched = dict(zip(
+        [pep_link for _, pep_link, _ in missing_rows],
+        html_pep_statuses(session, missing_rows, cli_args)
+    ))
+    statuses = [
+        (json_statuses[pep_link], None) if pep_link in json_statuses
+        else fetched[pep_link]
+        for _, pep_link, _ in rows
+    ]
+    if getattr(cli_args, 'incremental', False):
+        save_known_peps(BASE_DIR / STATE_DIR_NAME / PEP_STATE_FILE_NAME, {
+            row: dict(
+                link=pep_link, preview_status=preview_status, status=status
+            )
+            for (preview_status, pep_link, row), (status, error) in zip(
+                rows, statuses
+            )
+            if error is None
+        })
+    return statuses
+
+
+def crosscheck_pep_statuses(session, rows, cli_args):
+    json_statuses = load_json_statuses(session)
+    statuses = list(html_pep_statuses(session, rows, cli_args))
+    disagreements = dict.fromkeys(
+        (pep_link, status, json_statuses.get(pep_link))
+        for (_, pep_link, _), (status, error) in zip(rows, statuses)
+        if error is None and json_statuses.get(pep_link) != status
     )
-    dir = build_dir(BASE_DIR, DOWNLOADS_DIR_NAME)
-    archive_path = dir / archive_url.split('/')[-1]
-    response = session.get(archive_url)
-    with open(archive_path, 'wb') as file:
-        file.write(response.content)
-    logging.info(WHERE_IS_ARCHIVE_MESSAGE.format(path=archive_path))
+    for pep_link, html_status, json_status in disagreements:
+        logging.warning(DISAGREEMENT_MESSAGE.format(
+            link=pep_link, html_status=html_status,
+            url=PEPS_JSON_URL, json_status=json_status
+        ))
+    logging.info(CROSSCHECK_MESSAGE.format(
+        url=PEPS_JSON_URL, count=len(disagreements)
+    ))
+    return statuses
+
+
+PEP_SOURCES = {
+    HTML_SOURCE: html_pep_statuses,
+    JSON_SOURCE: json_pep_statuses,
+    CROSSCHECK_SOURCE: crosscheck_pep_statuses
+}
 
 
-def pep(session):
+def pep_journal_name(shard):
+    if shard is None:
+        return 'pep'
+    return 'pep_shard_{}_of_{}'.format(*shard)
+
+
+def pep_outcomes(session, cli_args=None):
+    from checkpoints import open_journal
+    from shards import in_shard, index_fingerprint
+
+    rows, peps_with_no_preview = pep_index_rows(session)
+    shard = getattr(cli_args, 'shard', None)
+    journal = open_journal(
+        cli_args, pep_journal_name(shard), index_fingerprint(rows)
+    )
+    positions = [
+        position for position, (_, pep_link, _) in enumerate(rows)
+        if (shard is None or in_shard(pep_link, shard))
+        and position not in journal.done
+    ]
+    pending_rows = [rows[position] for position in positions]
+    statuses = PEP_SOURCES[
+        getattr(cli_args, 'source', DEFAULT_PEP_SOURCE)
+    ](session, pending_rows, cli_args)
+    try:
+        for position, (preview_status, pep_link, _), (status, error) in zip(
+            positions,
+            pending_rows,
+            track_progress(statuses, len(pending_rows))
+        ):
+            journal.record(
+                position, (position, preview_status, pep_link, status, error)
+            )
+    finally:
+        journal.flush()
+    outcomes = [journal.done[position] for position in sorted(journal.done)]
+    return rows, outcomes, peps_with_no_preview, journal
+
+
+def pep_report(outcomes, peps_with_no_preview):
     statuses_counter = defaultdict(int)
-    peps_with_no_preview = []
     non_matching_statuses = []
     error_requests = []
-    all_tables = prepare_soup(session, MAIN_PEPS_URL).find_all(
-        'table',
-        attrs={'class': 'pep-zero-table docutils align-default'}
-    )
-    for current_table in tqdm(all_tables):
-        table_body = find_tag(current_table, 'tbody')
-        table_rows = table_body.find_all('tr')
-        for current_row in table_rows:
-            try:
-                preview_status = current_row.find('abbr').text[1:]
-            except AttributeError:
-                preview_status = ''
-                peps_with_no_preview.append(
-                    current_row.find(
-                        attrs={'class': 'pep reference internal'}
-                    ).text
-                )
-            pep_link = urljoin(
-                MAIN_PEPS_URL,
-                find_tag(
-                    current_row,
-                    'a',
-                    attrs={'class': 'pep reference internal'}
-                )['href']
+    for _, preview_status, pep_link, status, error in outcomes:
+        if error is not None:
+            error_requests.append(error)
+            continue
+        statuses_counter[status] += 1
+        if status not in EXPECTED_STATUS[preview_status]:
+            non_matching_statuses.append(
+                (pep_link, status, EXPECTED_STATUS[preview_status])
             )
-            try:
-                main_dl = find_tag(
-                    prepare_soup(session, pep_link),
-                    'dl'
-                )
-            except ConnectionError as err:
-                error_requests.append(
-                    REQUEST_ERROR.format(url=pep_link, err=err)
-                )
-                continue
-            pre_status_section = main_dl.find(string='Status').parent
-            status = pre_status_section.find_next_sibling().string
-            statuses_counter[status] += 1
-            if status not in EXPECTED_STATUS[preview_status]:
-                non_matching_statuses.append(
-                    (pep_link, status, EXPECTED_STATUS[preview_status])
-                )
     logging.info(
         NO_PREVIEW_MESSAGE.format(peps=peps_with_no_preview)
     )
@@ -150,11 +379,35 @@ def pep(session):
         logging.error(
             error
         )
-    return [
-        ('Статус', 'Количество'),
-        *statuses_counter.items(),
-        ('Всего', sum(statuses_counter.values()))
-    ]
+    yield ('Статус', 'Количество')
+    yield from statuses_counter.items()
+    yield (TOTAL_ROW_LABEL, sum(statuses_counter.values()))
+
+
+def finish_journal(results, journal):
+    yield from results
+    journal.finish()
+
+
+def pep(session, cli_args=None):
+    rows, outcomes, peps_with_no_preview, journal = pep_outcomes(
+        session, cli_args
+    )
+    shard = getattr(cli_args, 'shard', None)
+    if shard is None:
+        return finish_journal(
+            pep_report(outcomes, peps_with_no_preview), journal
+        )
+    from shards import index_fingerprint, save_shard
+
+    save_shard(
+        build_dir(BASE_DIR, SHARDS_DIR_NAME),
+        shard,
+        index_fingerprint(rows),
+        outcomes,
+        peps_with_no_preview
+    )
+    journal.finish()
 
 
 MODE_TO_FUNCTION = {
@@ -165,19 +418,181 @@ MODE_TO_FUNCTION = {
 }
 
 
+def expand_modes(mode_names):
+    return list(dict.fromkeys(
+        mode
+        for name in mode_names
+        for mode in (MODE_TO_FUNCTION if name == ALL_MODES_ARG else (name,))
+    ))
+
+
+def run_mode(session, cli_args, output_lock=None):
+    from outputs import control_output
+
+    results = MODE_TO_FUNCTION[cli_args.mode](session, cli_args)
+    if results is None:
+        return
+    if output_lock is None:
+        control_output(results, cli_args)
+        return
+    results = list(results)
+    with output_lock:
+        control_output(results, cli_args)
+
+
+def run_modes(session, cli_args, modes):
+    if len(modes) == 1:
+        run_mode(session, mode_args(cli_args, modes[0]))
+        return
+    output_lock = Lock()
+    with ThreadPoolExecutor(max_workers=len(modes)) as executor:
+        futures = {
+            mode: executor.submit(
+                run_mode,
+                session,
+                mode_args(cli_args, mode),
+                output_lock
+            )
+            for mode in modes
+        }
+    for mode, future in futures.items():
+        try:
+            future.result()
+        except Exception as err:
+            logging.error(MODE_ERROR_MESSAGE.format(mode=mode, err=err))
+
+
+def watch_modes(session, cli_args, modes):
+    from watch import watch
+
+    watch(session, cli_args, modes or list(MODE_TO_FUNCTION), MODE_TO_FUNCTION)
+
+
+def serve_modes(session, cli_args, modes):
+    from serve import serve
+
+    serve(session, cli_args, modes, MODE_TO_FUNCTION)
+
+
+def show_cache_stats(session, cli_args, modes):
+    from cache_store import cache_stats
+    from outputs import control_output
+
+    stats = cache_stats(session.cache)
+    control_output(
+        [
+            ('Показатель', 'Значение'),
+            ('Записей', stats['entries']),
+            ('Размер ответов, байт', stats['body_bytes']),
+            ('Размер файла кеша, байт', stats['file_bytes']),
+            ('Попаданий', stats['hits']),
+            ('Промахов', stats['misses']),
+            ('Доля попаданий, %', round(stats['hit_ratio'] * 100, 1))
+        ],
+        mode_args(cli_args, CACHE_STATS_COMMAND)
+    )
+
+
+def export_cache(session, cli_args, modes):
+    from snapshot import export_snapshot
+
+    export_snapshot(session, cli_args.snapshot, cli_args.cache_backend)
+
+
+def import_cache(session, cli_args, modes):
+    from snapshot import import_snapshot
+
+    import_snapshot(session, cli_args.snapshot, cli_args.cache_backend)
+
+
+def merge_shards(session, cli_args, modes):
+    from outputs import control_output
+    from shards import load_shards
+
+    control_output(
+        pep_report(*load_shards(BASE_DIR / SHARDS_DIR_NAME)),
+        mode_args(cli_args, 'pep')
+    )
+
+
+COMMAND_TO_FUNCTION = {
+    WATCH_COMMAND: watch_modes,
+    SERVE_COMMAND: serve_modes,
+    CACHE_STATS_COMMAND: show_cache_stats,
+    CACHE_EXPORT_COMMAND: export_cache,
+    CACHE_IMPORT_COMMAND: import_cache,
+    MERGE_COMMAND: merge_shards
+}
+
+
+def split_command(parser, names):
+    command = names[0] if names[0] in COMMAND_TO_FUNCTION else None
+    mode_names = names[1:] if command else names
+    for name in mode_names:
+        if name in COMMAND_TO_FUNCTION:
+            parser.error(COMMAND_POSITION_MESSAGE.format(command=name))
+    return command, expand_modes(mode_names)
+
+
+def report_run(cli_args, run_name, now):
+    logging.info(CACHE_STATS_MESSAGE.format(**CACHE_STATS))
+    limits = limits_snapshot()
+    for host, host_limits in limits.items():
+        logging.info(LIMITS_MESSAGE.format(host=host, **host_limits))
+    log_summary()
+    if cli_args.report is not None:
+        write_report(
+            build_dir(BASE_DIR, REPORTS_DIR_NAME)
+            / REPORT_FILE_NAMES[cli_args.report].format(
+                mode=run_name, now=now
+            ),
+            cli_args.report,
+            cache=dict(CACHE_STATS),
+            limits=limits
+        )
+
+
 def main():
+    parser = configure_argument_parser(
+        (*MODE_TO_FUNCTION, ALL_MODES_ARG, *COMMAND_TO_FUNCTION)
+    )
+    args = parser.parse_args()
+    command, modes = split_command(parser, args.mode)
+    if args.shard is not None and (command is not None or modes != ['pep']):
+        parser.error(SHARD_MODE_MESSAGE)
+    for mode, _ in args.interval:
+        if mode is not None and mode not in MODE_TO_FUNCTION:
+            parser.error(UNKNOWN_INTERVAL_MODE_MESSAGE.format(mode=mode))
+    if command == SERVE_COMMAND and modes and not (
+        set(modes) & set(SERVED_MODES)
+    ):
+        parser.error(NOTHING_TO_SERVE_MESSAGE.format(
+            modes=modes, served=list(SERVED_MODES)
+        ))
+    run = COMMAND_TO_FUNCTION.get(command, run_modes)
     configure_logging()
     logging.info(START_PARSING_MESSAGE)
     try:
-        args = configure_argument_parser(MODE_TO_FUNCTION.keys()).parse_args()
+        from cache_store import save_run_stats
+        from sessions import create_session
+
         logging.info(CLI_ARGS_MESSAGE.format(args=args))
-        session = requests_cache.CachedSession()
+        session = create_session(args)
         if args.clear_cache:
             session.cache.clear()
-        parser_mode = args.mode
-        results = MODE_TO_FUNCTION[parser_mode](session)
-        if results is not None:
-            control_output(results, args)
+        now = dt.datetime.now().strftime(DATETIME_FORMAT)
+        run_name = '_'.join((command, *modes) if command else modes)
+        if args.profile:
+            profile_call(
+                build_dir(BASE_DIR, REPORTS_DIR_NAME)
+                / PROFILE_FILE_NAME.format(mode=run_name, now=now),
+                run, session, args, modes
+            )
+        else:
+            run(session, args, modes)
+        save_run_stats(session.cache, CACHE_STATS)
+        session.close()
+        report_run(args, run_name, now)
     except Exception as err:
         logging.error(
             ERROR_MESSAGE.format(err=err)
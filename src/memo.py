@@ -0,0 +1,154 @@
+from functools import partial
+import hashlib
+import json
+from pathlib import Path
+from threading import Lock
+import time
+
+from constants import (
+    BASE_DIR, EXTRACTION_CACHE_FILE_NAME, EXTRACTION_LIBRARIES,
+    STATE_DIR_NAME
+)
+from metrics import increment
+from utils import build_dir, fingerprint
+
+MISSING = object()
+
+EXTRACTION_CACHES = {}
+EXTRACTION_CACHES_LOCK = Lock()
+
+
+def extraction_version():
+    from importlib.metadata import PackageNotFoundError, version
+    import extractors
+    import utils
+
+    digest = hashlib.sha256()
+    for module in (extractors, utils):
+        digest.update(Path(module.__file__).read_bytes())
+    for library in EXTRACTION_LIBRARIES:
+        try:
+            digest.update(version(library).encode())
+        except PackageNotFoundError:
+            continue
+    return digest.hexdigest()
+
+
+def extractor_name(extractor):
+    if isinstance(extractor, partial):
+        return '{}({})'.format(
+            extractor_name(extractor.func),
+            ','.join(map(extractor_name, extractor.args))
+        )
+    return extractor.__qualname__
+
+
+def decode(value):
+    value = json.loads(value)
+    return tuple(value) if isinstance(value, list) else value
+
+
+class ExtractionCache:
+    def __init__(self, path, max_entries, version):
+        import sqlite3
+
+        self.lock = Lock()
+        self.max_entries = max_entries
+        self.pending = {}
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS meta '
+                '(name TEXT PRIMARY KEY, value TEXT)'
+            )
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS extracted '
+                '(key TEXT PRIMARY KEY, value TEXT, used_at REAL)'
+            )
+            stored = self.connection.execute(
+                "SELECT value FROM meta WHERE name = 'version'"
+            ).fetchone()
+            if stored is None or stored[0] != version:
+                self.connection.execute('DELETE FROM extracted')
+                self.connection.execute(
+                    "REPLACE INTO meta VALUES ('version', ?)", (version,)
+                )
+
+    def key(self, html, extractor):
+        return '{}:{}'.format(fingerprint(html), extractor_name(extractor))
+
+    def get(self, key):
+        with self.lock:
+            if key in self.pending:
+                value = self.pending[key][0]
+            else:
+                row = self.connection.execute(
+                    'SELECT value FROM extracted WHERE key = ?', (key,)
+                ).fetchone()
+                value = None if row is None else row[0]
+            if value is None:
+                increment('extraction_misses')
+                return MISSING
+            self.pending[key] = (value, time.time())
+        increment('extraction_hits')
+        return decode(value)
+
+    def put(self, key, value):
+        with self.lock:
+            self.pending[key] = (json.dumps(value), time.time())
+
+    def flush(self):
+        with self.lock, self.connection:
+            self.connection.executemany(
+                'INSERT INTO extracted VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET used_at = excluded.used_at',
+                [
+                    (key, value, used_at)
+                    for key, (value, used_at) in self.pending.items()
+                ]
+            )
+            self.pending.clear()
+            self.connection.execute(
+                'DELETE FROM extracted WHERE key IN (SELECT key '
+                'FROM extracted ORDER BY used_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+
+    def extract(self, pages, extractor, parse):
+        entries = []
+
+        def misses():
+            for html, error in pages:
+                key = None if error else self.key(html, extractor)
+                found = MISSING if error else self.get(key)
+                entries.append((key, found))
+                if found is MISSING:
+                    yield html, error
+
+        position = 0
+        try:
+            for value, error in parse(misses()):
+                while entries[position][1] is not MISSING:
+                    yield entries[position][1], None
+                    position += 1
+                if error is None:
+                    self.put(entries[position][0], value)
+                position += 1
+                yield value, error
+            for _, found in entries[position:]:
+                yield found, None
+        finally:
+            self.flush()
+
+
+def open_extraction_cache(cli_args):
+    max_entries = getattr(cli_args, 'extraction_cache_size', 0)
+    if not max_entries:
+        return None
+    path = build_dir(BASE_DIR, STATE_DIR_NAME) / EXTRACTION_CACHE_FILE_NAME
+    with EXTRACTION_CACHES_LOCK:
+        if path not in EXTRACTION_CACHES:
+            EXTRACTION_CACHES[path] = ExtractionCache(
+                path, max_entries, extraction_version()
+            )
+        return EXTRACTION_CACHES[path]
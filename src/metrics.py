@@ -0,0 +1,185 @@
+from bisect import bisect_left
+from collections import Counter, defaultdict
+import cProfile
+from functools import wraps
+import json
+import logging
+from threading import Lock
+import time
+
+from constants import DEFAULT_ENCODING, JSON_REPORT_ARG, LATENCY_BUCKETS
+
+STAGE_SUMMARY_MESSAGE = (
+    'Этап {stage}: вызовов {count}, ошибок {errors}, всего {total:.3f} с, '
+    'в среднем {mean:.2f} мс, 95% вызовов быстрее {p95:g} мс'
+)
+COUNTER_SUMMARY_MESSAGE = 'Счётчик {name}: {value}'
+WHERE_IS_REPORT_MESSAGE = 'Отчёт о работе сохранён. Путь: {path}'
+WHERE_IS_PROFILE_MESSAGE = 'Профиль сохранён. Путь: {path}'
+PROMETHEUS_PREFIX = 'bs4_parser'
+
+METRICS_LOCK = Lock()
+HISTOGRAMS = defaultdict(lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+DURATIONS = Counter()
+ERRORS = Counter()
+COUNTERS = Counter()
+
+
+def observe(stage, seconds, failed=False):
+    bucket = bisect_left(LATENCY_BUCKETS, seconds)
+    with METRICS_LOCK:
+        HISTOGRAMS[stage][bucket] += 1
+        DURATIONS[stage] += seconds
+        if failed:
+            ERRORS[stage] += 1
+
+
+def increment(name, value=1):
+    with METRICS_LOCK:
+        COUNTERS[name] += value
+
+
+def timed(stage):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                observe(stage, time.perf_counter() - started, failed)
+        return wrapper
+    return decorator
+
+
+def timed_consumer(stage):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(results, *args, **kwargs):
+            waited = 0.0
+            producer_failed = False
+
+            def produce():
+                nonlocal waited, producer_failed
+                iterator = iter(results)
+                while True:
+                    started = time.perf_counter()
+                    try:
+                        row = next(iterator)
+                    except StopIteration:
+                        return
+                    except BaseException:
+                        producer_failed = True
+                        raise
+                    finally:
+                        waited += time.perf_counter() - started
+                    yield row
+
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = func(produce(), *args, **kwargs)
+                failed = False
+                return result
+            finally:
+                observe(
+                    stage,
+                    time.perf_counter() - started - waited,
+                    failed and not producer_failed
+                )
+        return wrapper
+    return decorator
+
+
+def percentile_bound(histogram, share):
+    threshold = sum(histogram) * share
+    seen = 0
+    for bound, hits in zip((*LATENCY_BUCKETS, float('inf')), histogram):
+        seen += hits
+        if seen >= threshold:
+            return bound
+    return float('inf')
+
+
+def snapshot(**extra):
+    with METRICS_LOCK:
+        stages = {
+            stage: dict(
+                count=sum(histogram),
+                errors=ERRORS[stage],
+                total_seconds=round(DURATIONS[stage], 6),
+                buckets=dict(zip(
+                    (*map(str, LATENCY_BUCKETS), '+Inf'), histogram
+                ))
+            )
+            for stage, histogram in HISTOGRAMS.items()
+        }
+        return dict(stages=stages, counters=dict(COUNTERS), **extra)
+
+
+def log_summary():
+    with METRICS_LOCK:
+        for stage, histogram in HISTOGRAMS.items():
+            count = sum(histogram)
+            logging.info(STAGE_SUMMARY_MESSAGE.format(
+                stage=stage,
+                count=count,
+                errors=ERRORS[stage],
+                total=DURATIONS[stage],
+                mean=DURATIONS[stage] * 1000 / count if count else 0,
+                p95=percentile_bound(histogram, 0.95) * 1000
+            ))
+        for name, value in COUNTERS.items():
+            logging.info(COUNTER_SUMMARY_MESSAGE.format(
+                name=name, value=value
+            ))
+
+
+def prometheus_lines(data):
+    for stage, stats in data['stages'].items():
+        name = f'{PROMETHEUS_PREFIX}_stage_seconds'
+        cumulative = 0
+        for bound, hits in stats['buckets'].items():
+            cumulative += hits
+            yield f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}'
+        yield f'{name}_sum{{stage="{stage}"}} {stats["total_seconds"]}'
+        yield f'{name}_count{{stage="{stage}"}} {stats["count"]}'
+        yield (
+            f'{PROMETHEUS_PREFIX}_stage_errors_total{{stage="{stage}"}} '
+            f'{stats["errors"]}'
+        )
+    for name, value in data['counters'].items():
+        yield f'{PROMETHEUS_PREFIX}_{name}_total {value}'
+    for result, value in data.get('cache', {}).items():
+        yield (
+            f'{PROMETHEUS_PREFIX}_cache_responses_total{{result="{result}"}} '
+            f'{value}'
+        )
+    for host, limits in data.get('limits', {}).items():
+        for name in ('rate', 'concurrency'):
+            yield (
+                f'{PROMETHEUS_PREFIX}_host_{name}{{host="{host}"}} '
+                f'{limits[name]}'
+            )
+
+
+def write_report(path, report_format, **extra):
+    data = snapshot(**extra)
+    with open(path, 'w', encoding=DEFAULT_ENCODING) as file:
+        if report_format == JSON_REPORT_ARG:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+        else:
+            file.write('\n'.join(prometheus_lines(data)) + '\n')
+    logging.info(WHERE_IS_REPORT_MESSAGE.format(path=path))
+
+
+def profile_call(path, func, *args):
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args)
+    finally:
+        profiler.dump_stats(path)
+        logging.info(WHERE_IS_PROFILE_MESSAGE.format(path=path))
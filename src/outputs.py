@@ -1,30 +1,62 @@
 import csv
 import datetime as dt
+from itertools import count, islice
 import logging
 
-from prettytable import PrettyTable
-
 from constants import (
-    BASE_DIR, DATETIME_FORMAT, FILE_OUTPUT_ARG,
-    PRETTY_OUTPUT_ARG, RESULTS_DIR_NAME
+    BASE_DIR, DATABASE_FILE_NAME, DATETIME_FORMAT, FILE_OUTPUT_ARG,
+    PRETTY_OUTPUT_ARG, RESULTS_DIR_NAME, SQLITE_BATCH_SIZE, SQLITE_OUTPUT_ARG,
+    TOTAL_ROW_LABEL
 )
+from metrics import timed_consumer
 from utils import build_dir
 
 
 WHERE_IS_FILE_MESSAGE = 'Файл сохранён. Путь: {path}'
+WHERE_IS_TABLE_MESSAGE = (
+    'Результаты сохранены в базу {path}, таблица {table}, запуск {run_at}'
+)
 FILENAME = '{mode}_{now}.csv'
+SQLITE_TABLES = {
+    'whats-new': (
+        'whats_new',
+        (('link', 'TEXT'), ('title', 'TEXT'), ('editors', 'TEXT')),
+        ()
+    ),
+    'latest-versions': (
+        'latest_versions',
+        (('link', 'TEXT'), ('version', 'TEXT'), ('status', 'TEXT')),
+        ('version',)
+    ),
+    'pep': ('pep', (('status', 'TEXT'), ('count', 'INTEGER')), ('status',)),
+    'cache-stats': (
+        'cache_stats', (('metric', 'TEXT'), ('value', 'NUMERIC')), ('metric',)
+    ),
+}
+CREATE_TABLE_SQL = (
+    'CREATE TABLE IF NOT EXISTS {table} ('
+    'run_at TEXT NOT NULL, position INTEGER NOT NULL, {columns}, '
+    'PRIMARY KEY (run_at, position))'
+)
+CREATE_INDEX_SQL = (
+    'CREATE INDEX IF NOT EXISTS {table}_{column}_idx ON {table} ({column})'
+)
+INSERT_SQL = 'INSERT INTO {table} VALUES (?, ?, {placeholders})'
 
 
 def default_output(results, *args):
     for row in results:
-        print(*row)
+        print(*row, flush=True)
 
 
 def pretty_output(results, *args):
+    from prettytable import PrettyTable
+
+    results = iter(results)
     table = PrettyTable()
-    table.field_names = results[0]
+    table.field_names = next(results)
     table.align = 'l'
-    table.add_rows(results[1:])
+    table.add_rows(list(results))
     print(table)
 
 
@@ -35,16 +67,65 @@ def file_output(results, cli_args):
         now=dt.datetime.now().strftime(DATETIME_FORMAT)
     )
     with open(file_path, 'w', encoding='utf-8') as f:
-        csv.writer(f, dialect=csv.unix_dialect).writerows(results)
+        writer = csv.writer(f, dialect=csv.unix_dialect)
+        for row in results:
+            writer.writerow(row)
+            f.flush()
     logging.info(WHERE_IS_FILE_MESSAGE.format(path=file_path))
 
 
+def create_table(connection, table, columns, indexed):
+    connection.execute(CREATE_TABLE_SQL.format(
+        table=table,
+        columns=', '.join(
+            f'{column} {column_type}' for column, column_type in columns
+        )
+    ))
+    for column in indexed:
+        connection.execute(
+            CREATE_INDEX_SQL.format(table=table, column=column)
+        )
+
+
+def sqlite_output(results, cli_args):
+    import sqlite3
+
+    table, columns, indexed = SQLITE_TABLES[cli_args.mode]
+    run_at = dt.datetime.now().isoformat(timespec='microseconds')
+    insert_sql = INSERT_SQL.format(
+        table=table, placeholders=', '.join('?' * len(columns))
+    )
+    rows = (
+        (run_at, position, *row)
+        for position, row in zip(count(), (
+            row for row in islice(results, 1, None)
+            if row[0] != TOTAL_ROW_LABEL
+        ))
+    )
+    db_path = BASE_DIR / DATABASE_FILE_NAME
+    connection = sqlite3.connect(db_path)
+    try:
+        with connection:
+            create_table(connection, table, columns, indexed)
+            for batch in iter(
+                lambda: list(islice(rows, SQLITE_BATCH_SIZE)), []
+            ):
+                connection.executemany(insert_sql, batch)
+    finally:
+        connection.close()
+    logging.info(WHERE_IS_TABLE_MESSAGE.format(
+        path=db_path, table=table, run_at=run_at
+    ))
+
+
 OUTPUT_FINCTIONS = {
+    SQLITE_OUTPUT_ARG: sqlite_output,
     FILE_OUTPUT_ARG: file_output,
     PRETTY_OUTPUT_ARG: pretty_output,
     None: default_output
 }
 
 
+@timed_consumer('control_output')
 def control_output(results, cli_args):
     OUTPUT_FINCTIONS[cli_args.output](results, cli_args)
@@ -0,0 +1,175 @@
+from concurrent.futures import ThreadPoolExecutor
+import datetime as dt
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+from threading import Condition, Thread
+import time
+
+from configs import mode_args
+from constants import FIRST_RESULTS_TIMEOUT, SERVED_MODES, WATCH_TICK
+from watch import (
+    forget_parsed_pages, install_signal_handlers, restore_signal_handlers
+)
+
+SERVE_START_MESSAGE = 'API запущено: http://{host}:{port}/ режимы: {modes}'
+SERVE_STOP_MESSAGE = 'API остановлено'
+NOT_SERVED_MESSAGE = 'Режим {mode} не отдаётся через API'
+REFRESHED_MESSAGE = 'Результаты режима {mode} обновлены за {seconds:.2f} с'
+REFRESH_ERROR_MESSAGE = 'Не удалось обновить режим {mode}. Ошибка: {err}'
+RELOAD_MESSAGE = 'Получен SIGHUP, обновляем результаты всех режимов'
+REQUEST_MESSAGE = 'API: {line} - {status}'
+UNKNOWN_PATH_MESSAGE = 'Нет такого режима: {path}'
+NOT_READY_MESSAGE = 'Результаты режима {mode} ещё не готовы'
+JSON_CONTENT_TYPE = 'application/json; charset=utf-8'
+
+
+def encode_json(data):
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def results_body(mode, results):
+    columns, *rows = results
+    return encode_json(dict(
+        mode=mode,
+        refreshed_at=dt.datetime.now().isoformat(timespec='seconds'),
+        columns=list(columns),
+        rows=[list(row) for row in rows]
+    ))
+
+
+class ResultStore:
+    def __init__(self, modes, ttl):
+        self.condition = Condition()
+        self.modes = modes
+        self.ttl = ttl
+        self.bodies = {}
+        self.expires_at = dict.fromkeys(modes, 0)
+        self.errors = {}
+        self.refreshing = set()
+
+    def get(self, mode, timeout=FIRST_RESULTS_TIMEOUT):
+        with self.condition:
+            self.condition.wait_for(
+                lambda: mode in self.bodies or mode in self.errors,
+                timeout
+            )
+            return self.bodies.get(mode), self.errors.get(mode)
+
+    def due(self):
+        now = time.monotonic()
+        with self.condition:
+            due = [
+                mode for mode in self.modes
+                if mode not in self.refreshing
+                and self.expires_at[mode] <= now
+            ]
+            self.refreshing.update(due)
+        return due
+
+    def expire(self):
+        with self.condition:
+            self.expires_at = dict.fromkeys(self.modes, 0)
+
+    def store(self, mode, body=None, error=None):
+        with self.condition:
+            self.refreshing.discard(mode)
+            self.expires_at[mode] = time.monotonic() + self.ttl
+            if body is not None:
+                self.bodies[mode] = body
+                self.errors.pop(mode, None)
+            else:
+                self.errors[mode] = error
+            self.condition.notify_all()
+
+
+def refresh(session, cli_args, mode, mode_function, store):
+    started = time.perf_counter()
+    try:
+        results = list(mode_function(session, mode_args(cli_args, mode)))
+        body = results_body(mode, results)
+    except Exception as err:
+        logging.error(REFRESH_ERROR_MESSAGE.format(mode=mode, err=err))
+        store.store(mode, error=str(err))
+        return
+    store.store(mode, body=body)
+    logging.info(REFRESHED_MESSAGE.format(
+        mode=mode, seconds=time.perf_counter() - started
+    ))
+
+
+class ResultsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        store = self.server.store
+        mode = self.path.split('?')[0].strip('/')
+        if not mode:
+            self.send_json(HTTPStatus.OK, encode_json(dict(
+                modes=store.modes
+            )))
+            return
+        if mode not in store.modes:
+            self.send_json(HTTPStatus.NOT_FOUND, encode_json(dict(
+                error=UNKNOWN_PATH_MESSAGE.format(path=self.path)
+            )))
+            return
+        body, error = store.get(mode)
+        if body is None:
+            self.send_json(HTTPStatus.SERVICE_UNAVAILABLE, encode_json(dict(
+                error=error or NOT_READY_MESSAGE.format(mode=mode)
+            )))
+            return
+        self.send_json(HTTPStatus.OK, body)
+
+    def send_json(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', JSON_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_request(self, code='-', size='-'):
+        logging.debug(REQUEST_MESSAGE.format(
+            line=self.requestline, status=code
+        ))
+
+
+def create_server(store, host, port):
+    server = ThreadingHTTPServer((host, port), ResultsHandler)
+    server.daemon_threads = True
+    server.store = store
+    return server
+
+
+def serve(session, cli_args, modes, mode_functions):
+    modes = modes or list(SERVED_MODES)
+    for mode in modes:
+        if mode not in SERVED_MODES:
+            logging.warning(NOT_SERVED_MESSAGE.format(mode=mode))
+    modes = [mode for mode in modes if mode in SERVED_MODES]
+    store = ResultStore(modes, cli_args.results_ttl)
+    server = create_server(store, cli_args.host, cli_args.port)
+    events = {}
+    previous_handlers = install_signal_handlers(events)
+    Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(SERVE_START_MESSAGE.format(
+        host=cli_args.host, port=server.server_address[1], modes=modes
+    ))
+    try:
+        with ThreadPoolExecutor(max_workers=len(modes)) as executor:
+            while 'stop' not in events:
+                if events.pop('reload', None):
+                    logging.info(RELOAD_MESSAGE)
+                    forget_parsed_pages()
+                    store.expire()
+                for mode in store.due():
+                    executor.submit(
+                        refresh, session, cli_args, mode,
+                        mode_functions[mode], store
+                    )
+                time.sleep(WATCH_TICK)
+            server.shutdown()
+    finally:
+        server.server_close()
+        restore_signal_handlers(previous_handlers)
+    logging.info(SERVE_STOP_MESSAGE)
@@ -0,0 +1,101 @@
+import random
+import re
+import time
+from urllib.parse import urlsplit
+
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from constants import (
+    CACHE_NAME, COMPRESSED_CACHE_BACKEND, DEFAULT_BACKOFF,
+    DEFAULT_CACHE_SIZE, DEFAULT_POOL_SIZE, DEFAULT_RATE, DEFAULT_RETRIES,
+    DEFAULT_TIMEOUT, INDEX_EXPIRE_AFTER, INDEX_URLS, MEBIBYTE,
+    PAGE_EXPIRE_AFTER, RETRY_JITTER, RETRY_METHODS, RETRY_STATUSES,
+    SQLITE_CACHE_BACKEND
+)
+from cache_store import BoundedSQLiteCache, is_cacheable
+from throttling import is_throttled, limiter_for
+
+
+class JitterRetry(Retry):
+    def get_backoff_time(self):
+        backoff = super().get_backoff_time()
+        return backoff + random.uniform(0, backoff * RETRY_JITTER)
+
+
+class TunedHTTPAdapter(HTTPAdapter):
+    def __init__(self, timeout=DEFAULT_TIMEOUT, rate=DEFAULT_RATE, **kwargs):
+        self.timeout = timeout
+        self.rate = rate
+        super().__init__(**kwargs)
+
+    def send(self, request, timeout=None, **kwargs):
+        limiter = limiter_for(
+            urlsplit(request.url).netloc, self.rate, self._pool_maxsize
+        )
+        limiter.acquire()
+        started = time.perf_counter()
+        throttled = True
+        try:
+            response = super().send(
+                request, timeout=timeout or self.timeout, **kwargs
+            )
+            throttled = is_throttled(response)
+            return response
+        finally:
+            limiter.release(time.perf_counter() - started, throttled)
+
+
+def create_adapter(cli_args=None):
+    pool_size = getattr(cli_args, 'pool_size', DEFAULT_POOL_SIZE)
+    return TunedHTTPAdapter(
+        timeout=getattr(cli_args, 'timeout', DEFAULT_TIMEOUT),
+        rate=getattr(cli_args, 'rate', DEFAULT_RATE),
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        pool_block=True,
+        max_retries=JitterRetry(
+            total=getattr(cli_args, 'retries', DEFAULT_RETRIES),
+            backoff_factor=getattr(cli_args, 'backoff', DEFAULT_BACKOFF),
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_METHODS,
+            respect_retry_after_header=True
+        )
+    )
+
+
+def create_backend(cli_args=None):
+    if getattr(
+        cli_args, 'cache_backend', SQLITE_CACHE_BACKEND
+    ) != COMPRESSED_CACHE_BACKEND:
+        return SQLITE_CACHE_BACKEND
+    return BoundedSQLiteCache(
+        CACHE_NAME,
+        max_size=int(
+            getattr(cli_args, 'cache_size', DEFAULT_CACHE_SIZE) * MEBIBYTE
+        )
+    )
+
+
+def create_session(cli_args=None, **kwargs):
+    if 'backend' not in kwargs:
+        kwargs['backend'] = create_backend(cli_args)
+    index_expire_after = getattr(
+        cli_args, 'index_ttl', INDEX_EXPIRE_AFTER
+    )
+    session = requests_cache.CachedSession(
+        expire_after=getattr(cli_args, 'page_ttl', PAGE_EXPIRE_AFTER),
+        urls_expire_after={
+            re.compile(re.escape(url) + '$'): index_expire_after
+            for url in INDEX_URLS
+        },
+        filter_fn=is_cacheable,
+        only_if_cached=getattr(cli_args, 'offline', False),
+        stale_if_error=getattr(cli_args, 'offline', False),
+        **kwargs
+    )
+    adapter = create_adapter(cli_args)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -0,0 +1,79 @@
+import logging
+import zlib
+
+from constants import SHARD_FILE_NAME, SHARD_FILE_PATTERN, SHARD_VERSION
+from exceptions import ParserShardException
+from state import load_json, save_json
+from utils import fingerprint
+
+WHERE_IS_SHARD_MESSAGE = (
+    'Часть {index} из {count} сохранена, PEP в части: {peps}. Путь: {path}'
+)
+NO_SHARDS_MESSAGE = 'В папке {path} нет сохранённых частей прогона'
+SHARD_COUNT_MESSAGE = (
+    'Части прогона в {path} относятся к разным разбиениям: {counts}'
+)
+MISSING_SHARDS_MESSAGE = 'Не хватает частей прогона {missing} из {count}'
+INDEX_MISMATCH_MESSAGE = (
+    'Части прогона собраны по разным версиям таблицы PEP 0'
+)
+MERGED_MESSAGE = 'Объединено частей: {count}, PEP: {peps}'
+
+
+def in_shard(link, shard):
+    index, count = shard
+    return zlib.crc32(link.encode()) % count == index - 1
+
+
+def index_fingerprint(rows):
+    return fingerprint('\n'.join(pep_link for _, pep_link, _ in rows))
+
+
+def save_shard(shards_dir, shard, index, outcomes, peps_with_no_preview):
+    path = shards_dir / SHARD_FILE_NAME.format(index=shard[0], count=shard[1])
+    save_json(path, dict(
+        version=SHARD_VERSION,
+        shard=list(shard),
+        index=index,
+        no_preview=peps_with_no_preview,
+        outcomes=outcomes
+    ))
+    logging.info(WHERE_IS_SHARD_MESSAGE.format(
+        index=shard[0], count=shard[1], peps=len(outcomes), path=path
+    ))
+
+
+def load_shards(shards_dir):
+    partials = [
+        partial for partial in map(
+            load_json, sorted(shards_dir.glob(SHARD_FILE_PATTERN))
+        )
+        if partial.get('version') == SHARD_VERSION
+    ]
+    if not partials:
+        raise ParserShardException(NO_SHARDS_MESSAGE.format(path=shards_dir))
+    counts = {count for _, count in (partial['shard'] for partial in partials)}
+    if len(counts) > 1:
+        raise ParserShardException(SHARD_COUNT_MESSAGE.format(
+            path=shards_dir, counts=sorted(counts)
+        ))
+    count = counts.pop()
+    missing = sorted(
+        set(range(1, count + 1))
+        - {index for index, _ in (partial['shard'] for partial in partials)}
+    )
+    if missing:
+        raise ParserShardException(MISSING_SHARDS_MESSAGE.format(
+            missing=missing, count=count
+        ))
+    if len({partial['index'] for partial in partials}) > 1:
+        raise ParserShardException(INDEX_MISMATCH_MESSAGE)
+    outcomes = sorted(
+        (
+            tuple(outcome)
+            for partial in partials for outcome in partial['outcomes']
+        ),
+        key=lambda outcome: outcome[0]
+    )
+    logging.info(MERGED_MESSAGE.format(count=count, peps=len(outcomes)))
+    return outcomes, partials[0]['no_preview']
@@ -0,0 +1,143 @@
+import datetime as dt
+import io
+import json
+import logging
+import os
+from pathlib import Path
+import sqlite3
+import tarfile
+import tempfile
+
+from constants import (
+    BASE_DIR, CACHE_COMPRESSION_LEVEL, DEFAULT_ENCODING,
+    EXTRACTION_CACHE_FILE_NAME, PEP_STATE_FILE_NAME,
+    SNAPSHOT_MANIFEST_NAME, SNAPSHOT_VERSION, STATE_DIR_NAME
+)
+from downloads import file_sha256
+from exceptions import ParserSnapshotException
+
+HTTP_CACHE_MEMBER = 'http_cache.sqlite'
+EXTRACTION_CACHE_MEMBER = f'{STATE_DIR_NAME}/{EXTRACTION_CACHE_FILE_NAME}'
+PEP_STATE_MEMBER = f'{STATE_DIR_NAME}/{PEP_STATE_FILE_NAME}'
+SQLITE_MEMBERS = (HTTP_CACHE_MEMBER, EXTRACTION_CACHE_MEMBER)
+
+EXPORTED_MESSAGE = (
+    'Снимок кеша сохранён. Путь: {path}, файлов: {files}, '
+    'размер: {size} байт'
+)
+IMPORTED_MESSAGE = (
+    'Снимок кеша от {created} загружен из {path}, файлов: {files}'
+)
+BACKEND_MISMATCH_MESSAGE = (
+    'Снимок сделан с кешем {snapshot}, а сейчас выбран {current}: '
+    'часть ответов может не прочитаться'
+)
+NO_MANIFEST_MESSAGE = 'В снимке {path} нет описания {name}'
+VERSION_MISMATCH_MESSAGE = (
+    'Версия снимка {path} ({version}) не поддерживается, ожидается {expected}'
+)
+CHECKSUM_MISMATCH_MESSAGE = 'Файл {name} в снимке {path} повреждён'
+
+
+def snapshot_members(session):
+    return {
+        HTTP_CACHE_MEMBER: Path(session.cache.responses.db_path),
+        EXTRACTION_CACHE_MEMBER: (
+            BASE_DIR / STATE_DIR_NAME / EXTRACTION_CACHE_FILE_NAME
+        ),
+        PEP_STATE_MEMBER: BASE_DIR / STATE_DIR_NAME / PEP_STATE_FILE_NAME,
+    }
+
+
+def copy_sqlite(source, target):
+    source_connection = sqlite3.connect(source)
+    target_connection = sqlite3.connect(target)
+    try:
+        source_connection.backup(target_connection)
+    finally:
+        target_connection.close()
+        source_connection.close()
+
+
+def export_snapshot(session, path, backend):
+    session.cache.close()
+    manifest = dict(
+        version=SNAPSHOT_VERSION,
+        created=dt.datetime.now().isoformat(timespec='seconds'),
+        backend=backend,
+        files={}
+    )
+    with tempfile.TemporaryDirectory() as work_dir:
+        copies = {}
+        for name, source in snapshot_members(session).items():
+            if not source.exists():
+                continue
+            copies[name] = Path(work_dir) / name.replace('/', '_')
+            if name in SQLITE_MEMBERS:
+                copy_sqlite(source, copies[name])
+            else:
+                copies[name].write_bytes(source.read_bytes())
+            manifest['files'][name] = file_sha256(copies[name])
+        temp_path = path.with_name(path.name + '.tmp')
+        with tarfile.open(
+            temp_path, 'w:gz', compresslevel=CACHE_COMPRESSION_LEVEL
+        ) as archive:
+            data = json.dumps(manifest, indent=2).encode(DEFAULT_ENCODING)
+            info = tarfile.TarInfo(SNAPSHOT_MANIFEST_NAME)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+            for name, copy in copies.items():
+                archive.add(copy, arcname=name)
+        os.replace(temp_path, path)
+    logging.info(EXPORTED_MESSAGE.format(
+        path=path, files=len(copies), size=path.stat().st_size
+    ))
+
+
+def read_manifest(archive, path):
+    try:
+        manifest = json.load(archive.extractfile(SNAPSHOT_MANIFEST_NAME))
+    except KeyError:
+        raise ParserSnapshotException(NO_MANIFEST_MESSAGE.format(
+            path=path, name=SNAPSHOT_MANIFEST_NAME
+        ))
+    if manifest.get('version') != SNAPSHOT_VERSION:
+        raise ParserSnapshotException(VERSION_MISMATCH_MESSAGE.format(
+            path=path, version=manifest.get('version'),
+            expected=SNAPSHOT_VERSION
+        ))
+    return manifest
+
+
+def import_snapshot(session, path, backend):
+    targets = snapshot_members(session)
+    session.cache.close()
+    with tarfile.open(path, 'r:gz') as archive:
+        manifest = read_manifest(archive, path)
+        if manifest['backend'] != backend:
+            logging.warning(BACKEND_MISMATCH_MESSAGE.format(
+                snapshot=manifest['backend'], current=backend
+            ))
+        staged = {}
+        try:
+            for name, digest in manifest['files'].items():
+                if name not in targets:
+                    continue
+                target = targets[name]
+                target.parent.mkdir(exist_ok=True)
+                staged[name] = target.with_name(target.name + '.import')
+                with open(staged[name], 'wb') as file:
+                    file.write(archive.extractfile(name).read())
+                if file_sha256(staged[name]) != digest:
+                    raise ParserSnapshotException(
+                        CHECKSUM_MISMATCH_MESSAGE.format(name=name, path=path)
+                    )
+            for name, staged_path in staged.items():
+                os.replace(staged_path, targets[name])
+        finally:
+            for staged_path in staged.values():
+                if staged_path.exists():
+                    staged_path.unlink()
+    logging.info(IMPORTED_MESSAGE.format(
+        created=manifest['created'], path=path, files=len(staged)
+    ))
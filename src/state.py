@@ -0,0 +1,20 @@
+import json
+import os
+
+from constants import DEFAULT_ENCODING
+
+
+def load_json(path):
+    try:
+        with open(path, encoding=DEFAULT_ENCODING) as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_json(path, data):
+    path.parent.mkdir(exist_ok=True)
+    temp_path = path.with_name(path.name + '.tmp')
+    with open(temp_path, 'w', encoding=DEFAULT_ENCODING) as file:
+        json.dump(data, file, ensure_ascii=False)
+    os.replace(temp_path, path)
@@ -0,0 +1,119 @@
+from collections import deque
+from threading import Condition, Lock
+import time
+
+from constants import (
+    CONCURRENCY_BACKOFF, DEFAULT_RATE, INITIAL_CONCURRENCY,
+    LATENCY_SMOOTHING, LATENCY_TOLERANCE, LATENCY_WINDOW, MIN_RATE,
+    RATE_BACKOFF, RATE_STEP, THROTTLE_STATUSES
+)
+
+LIMIT_POSTFIX = '{host} {rate:.1f}/с x{concurrency}'
+
+LIMITERS = {}
+LIMITERS_LOCK = Lock()
+
+
+class HostLimiter:
+    def __init__(self, max_rate=DEFAULT_RATE,
+                 max_concurrency=INITIAL_CONCURRENCY):
+        self.condition = Condition()
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.tokens = 1.0
+        self.refilled_at = time.monotonic()
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(min(INITIAL_CONCURRENCY, max_concurrency))
+        self.active = 0
+        self.latency = None
+        self.recent_latencies = deque(maxlen=LATENCY_WINDOW)
+        self.throttled = 0
+
+    def take_token(self):
+        now = time.monotonic()
+        self.tokens = min(
+            max(self.rate, 1.0),
+            self.tokens + (now - self.refilled_at) * self.rate
+        )
+        self.refilled_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        with self.condition:
+            while self.active >= int(self.concurrency):
+                self.condition.wait()
+            self.active += 1
+            wait = self.take_token()
+            while wait:
+                self.condition.wait(wait)
+                wait = self.take_token()
+
+    def release(self, seconds, throttled=False):
+        with self.condition:
+            self.active -= 1
+            if throttled:
+                self.throttled += 1
+                self.rate = max(MIN_RATE, self.rate * RATE_BACKOFF)
+                self.concurrency = max(
+                    1.0, self.concurrency * CONCURRENCY_BACKOFF
+                )
+            else:
+                self.adapt(seconds)
+            self.condition.notify_all()
+
+    def adapt(self, seconds):
+        self.latency = seconds if self.latency is None else (
+            LATENCY_SMOOTHING * seconds
+            + (1 - LATENCY_SMOOTHING) * self.latency
+        )
+        self.recent_latencies.append(seconds)
+        if self.latency > min(self.recent_latencies) * LATENCY_TOLERANCE:
+            self.concurrency = max(1.0, self.concurrency - 1)
+            return
+        self.rate = min(self.max_rate, self.rate + RATE_STEP)
+        self.concurrency = min(
+            self.max_concurrency,
+            self.concurrency + 1 / self.concurrency
+        )
+
+    def snapshot(self):
+        with self.condition:
+            return dict(
+                rate=round(self.rate, 2),
+                concurrency=int(self.concurrency),
+                active=self.active,
+                latency_ms=round((self.latency or 0) * 1000, 2),
+                throttled=self.throttled
+            )
+
+
+def limiter_for(host, max_rate=DEFAULT_RATE,
+                max_concurrency=INITIAL_CONCURRENCY):
+    with LIMITERS_LOCK:
+        if host not in LIMITERS:
+            LIMITERS[host] = HostLimiter(max_rate, max_concurrency)
+        return LIMITERS[host]
+
+
+def is_throttled(response):
+    retries = getattr(response.raw, 'retries', None)
+    return response.status_code in THROTTLE_STATUSES or any(
+        attempt.status in THROTTLE_STATUSES or attempt.error is not None
+        for attempt in getattr(retries, 'history', ())
+    )
+
+
+def limits_snapshot():
+    with LIMITERS_LOCK:
+        limiters = dict(LIMITERS)
+    return {host: limiter.snapshot() for host, limiter in limiters.items()}
+
+
+def limits_postfix():
+    return ', '.join(
+        LIMIT_POSTFIX.format(host=host, **limits)
+        for host, limits in limits_snapshot().items()
+    )
@@ -1,17 +1,72 @@
-from bs4 import BeautifulSoup
-from requests import RequestException
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+import hashlib
+from threading import Lock
+import time
 
-from constants import DEFAULT_ENCODING, DEFAULT_FEATURE
+from constants import (
+    DEFAULT_ENCODING, DEFAULT_FEATURE, NOT_CACHED_STATUS, PARSE_START_METHOD,
+    PARSE_QUEUE_FACTOR
+)
 from exceptions import ParserFindTagException
+from metrics import increment, observe, timed
 
 REQUEST_ERROR = 'Не удалось загрузить страницу {url}. Ошибка: {err}'
 EMPTY_RESPONSE = 'Вернулся пустой ответ при запросе на {url}'
 NO_TAG_MESSAGE = 'Не найден тег {tag} {attrs}'
+NO_NODE_MESSAGE = 'Не найден элемент {path}'
+NOT_CACHED_MESSAGE = 'Страницы {url} нет в кеше, а запросы в сеть отключены'
 
+CACHE_STATS = Counter(hit=0, revalidated=0, miss=0)
+CACHE_STATS_LOCK = Lock()
+IN_FLIGHT = {}
+IN_FLIGHT_LOCK = Lock()
+PARSED_PAGES = {}
+PARSED_PAGES_LOCK = Lock()
 
+
+def count_cache_result(response):
+    if getattr(response, 'revalidated', False):
+        result = 'revalidated'
+    elif getattr(response, 'from_cache', False):
+        result = 'hit'
+    else:
+        result = 'miss'
+    with CACHE_STATS_LOCK:
+        CACHE_STATS[result] += 1
+    if result == 'miss':
+        increment('bytes_received', len(response.content))
+
+
+@contextmanager
+def single_flight(key):
+    with IN_FLIGHT_LOCK:
+        lock, users = IN_FLIGHT.get(key, (Lock(), 0))
+        IN_FLIGHT[key] = (lock, users + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with IN_FLIGHT_LOCK:
+            lock, users = IN_FLIGHT.pop(key)
+            if users > 1:
+                IN_FLIGHT[key] = (lock, users - 1)
+
+
+@timed('get_response')
 def get_response(session, url, encoding=DEFAULT_ENCODING):
+    from requests import RequestException
+
     try:
-        response = session.get(url)
+        with single_flight(url):
+            response = session.get(url)
+        if getattr(
+            getattr(session, 'settings', None), 'only_if_cached', False
+        ) and response.status_code == NOT_CACHED_STATUS:
+            raise ConnectionError(NOT_CACHED_MESSAGE.format(url=url))
+        count_cache_result(response)
         response.encoding = encoding
         return response
     except RequestException as err:
@@ -20,10 +75,53 @@ def get_response(session, url, encoding=DEFAULT_ENCODING):
         )
 
 
-def prepare_soup(session, url, features=DEFAULT_FEATURE):
-    return BeautifulSoup(get_response(session, url).text, features=features)
+@timed('make_soup')
+def make_soup(html, features=DEFAULT_FEATURE, parse_only=None):
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, features=features, parse_only=parse_only)
+
 
+@timed('make_tree')
+def make_tree(html):
+    from lxml.html import document_fromstring
 
+    return document_fromstring(html)
+
+
+def timed_extract(extractor, html):
+    started = time.perf_counter()
+    value = extractor(html)
+    return value, time.perf_counter() - started
+
+
+def extracted(value, seconds):
+    observe('extract', seconds)
+    return value
+
+
+def parse_page(session, url, parser):
+    html = get_response(session, url).text
+    page = fingerprint(html)
+    with PARSED_PAGES_LOCK:
+        parsed = PARSED_PAGES.get((url, parser))
+    if parsed is not None and parsed[0] == page:
+        increment('reused_parses')
+        return parsed[1]
+    value = extracted(*timed_extract(parser, html))
+    with PARSED_PAGES_LOCK:
+        PARSED_PAGES[(url, parser)] = (page, value)
+    return value
+
+
+def fetch_page(session, url):
+    try:
+        return get_response(session, url).text, None
+    except ConnectionError as err:
+        return None, REQUEST_ERROR.format(url=url, err=err)
+
+
+@timed('find_tag')
 def find_tag(soup, tag, attrs=None):
     searched_tag = soup.find(tag, attrs=(attrs or {}))
     if searched_tag is None:
@@ -33,7 +131,73 @@ def find_tag(soup, tag, attrs=None):
     return searched_tag
 
 
+@timed('find_tag')
+def find_node(tree, xpath):
+    found = xpath(tree)
+    if not found:
+        raise ParserFindTagException(
+            NO_NODE_MESSAGE.format(path=xpath.path)
+        )
+    return found[0]
+
+
+def fingerprint(text):
+    return hashlib.sha256(text.encode(DEFAULT_ENCODING)).hexdigest()
+
+
 def build_dir(base_dir, subdir):
     dir = base_dir / subdir
     dir.mkdir(exist_ok=True)
     return dir
+
+
+def map_concurrently(func, items, workers=1):
+    if workers <= 1:
+        yield from map(func, items)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(func, items)
+
+
+def extract_pages(session, urls, extractor, workers=1, parse_workers=1,
+                  memo=None):
+    pages = map_concurrently(partial(fetch_page, session), urls, workers)
+    parse = partial(
+        parse_pages, extractor=extractor, parse_workers=parse_workers
+    )
+    if memo is None:
+        return parse(pages)
+    return memo.extract(pages, extractor, parse)
+
+
+def parse_pages(pages, extractor, parse_workers=1):
+    if parse_workers <= 1:
+        for html, error in pages:
+            yield (None, error) if error else (
+                extracted(*timed_extract(extractor, html)), None
+            )
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+
+    with ProcessPoolExecutor(
+        max_workers=parse_workers,
+        mp_context=multiprocessing.get_context(PARSE_START_METHOD)
+    ) as executor:
+        pending = deque()
+        for html, error in pages:
+            pending.append(
+                (None, error) if error else (
+                    executor.submit(timed_extract, extractor, html), None
+                )
+            )
+            while len(pending) > parse_workers * PARSE_QUEUE_FACTOR:
+                yield unwrap_extracted(*pending.popleft())
+        while pending:
+            yield unwrap_extracted(*pending.popleft())
+
+
+def unwrap_extracted(future, error):
+    return (None, error) if future is None else (
+        extracted(*future.result()), None
+    )
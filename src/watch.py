@@ -0,0 +1,144 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import logging
+import signal
+from threading import Lock
+import time
+
+from configs import mode_args
+from constants import DEFAULT_WATCH_INTERVAL, WATCH_TICK
+from utils import PARSED_PAGES, PARSED_PAGES_LOCK
+
+WATCH_START_MESSAGE = 'Наблюдение запущено, интервалы: {intervals}'
+UNCHANGED_MESSAGE = 'Результаты режима {mode} не изменились'
+RELOAD_MESSAGE = 'Получен SIGHUP, перезапускаем все режимы'
+DRAIN_MESSAGE = 'Получен сигнал {signal}, ждём завершения режимов: {modes}'
+WATCH_STOP_MESSAGE = 'Наблюдение остановлено'
+MODE_ERROR_MESSAGE = 'Сбой в режиме {mode}. Ошибка: {err}'
+
+
+def watch_intervals(cli_args, modes):
+    items = getattr(cli_args, 'interval', None) or ()
+    default = DEFAULT_WATCH_INTERVAL
+    custom = {}
+    for mode, seconds in items:
+        if mode is None:
+            default = seconds
+        else:
+            custom[mode] = seconds
+    return {mode: custom.get(mode, default) for mode in modes}
+
+
+def install_signal_handlers(events):
+    def request(name):
+        def handler(signum, frame):
+            events[name] = signal.Signals(signum).name
+        return handler
+
+    previous = {}
+    for signal_name, event in (
+        ('SIGTERM', 'stop'), ('SIGINT', 'stop'), ('SIGHUP', 'reload')
+    ):
+        if hasattr(signal, signal_name):
+            signum = getattr(signal, signal_name)
+            previous[signum] = signal.signal(signum, request(event))
+    return previous
+
+
+def restore_signal_handlers(previous):
+    for signum, handler in previous.items():
+        signal.signal(signum, handler)
+
+
+def forget_parsed_pages():
+    with PARSED_PAGES_LOCK:
+        PARSED_PAGES.clear()
+
+
+def refresh(session, cli_args, mode_function):
+    results = mode_function(session, cli_args)
+    return None if results is None else list(results)
+
+
+def publish(mode, results, last_results, cli_args, output_lock):
+    from outputs import control_output
+
+    if results is None:
+        return
+    if last_results.get(mode) == results:
+        logging.info(UNCHANGED_MESSAGE.format(mode=mode))
+        return
+    last_results[mode] = results
+    with output_lock:
+        control_output(results, mode_args(cli_args, mode))
+
+
+def collect(running, next_run, intervals, last_results, cli_args,
+            output_lock):
+    for mode, future in list(running.items()):
+        if not future.done():
+            continue
+        del running[mode]
+        next_run[mode] = time.monotonic() + intervals[mode]
+        try:
+            publish(
+                mode, future.result(), last_results, cli_args, output_lock
+            )
+        except Exception as err:
+            logging.error(MODE_ERROR_MESSAGE.format(mode=mode, err=err))
+
+
+def watch(session, cli_args, modes, mode_functions):
+    intervals = watch_intervals(cli_args, modes)
+    events = {}
+    output_lock = Lock()
+    previous_handlers = install_signal_handlers(events)
+    logging.info(WATCH_START_MESSAGE.format(intervals=intervals))
+    try:
+        watch_loop(
+            session, cli_args, modes, mode_functions, intervals, events,
+            output_lock
+        )
+    finally:
+        restore_signal_handlers(previous_handlers)
+    logging.info(WATCH_STOP_MESSAGE)
+
+
+def watch_loop(session, cli_args, modes, mode_functions, intervals, events,
+               output_lock):
+    next_run = dict.fromkeys(modes, 0)
+    last_results = {}
+    running = {}
+    with ThreadPoolExecutor(max_workers=len(modes)) as executor:
+        while 'stop' not in events:
+            if events.pop('reload', None):
+                logging.info(RELOAD_MESSAGE)
+                forget_parsed_pages()
+                last_results.clear()
+                next_run = dict.fromkeys(modes, 0)
+            for mode in modes:
+                if mode not in running and next_run[mode] <= time.monotonic():
+                    running[mode] = executor.submit(
+                        refresh,
+                        session,
+                        mode_args(cli_args, mode),
+                        mode_functions[mode]
+                    )
+            if running:
+                wait(
+                    running.values(),
+                    timeout=WATCH_TICK,
+                    return_when=FIRST_COMPLETED
+                )
+            else:
+                time.sleep(WATCH_TICK)
+            collect(
+                running, next_run, intervals, last_results, cli_args,
+                output_lock
+            )
+        logging.info(DRAIN_MESSAGE.format(
+            signal=events['stop'], modes=list(running)
+        ))
+        wait(running.values())
+        collect(
+            running, next_run, intervals, last_results, cli_args, output_lock
+        )
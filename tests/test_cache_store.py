@@ -0,0 +1,121 @@
+import os
+from collections import Counter
+
+from requests_cache import CachedSession
+from requests_mock import Adapter
+
+try:
+    from src import cache_store
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `cache_store.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `cache_store.py`'
+
+PAGE_URL = 'mock://docs.python.org/3/{}/'
+
+
+def bounded_session(path, max_size, bodies):
+    session = CachedSession(
+        backend=cache_store.BoundedSQLiteCache(path, max_size=max_size),
+        filter_fn=cache_store.is_cacheable
+    )
+    adapter = Adapter()
+    for name, (body, content_type) in bodies.items():
+        adapter.register_uri(
+            'GET', PAGE_URL.format(name), content=body,
+            headers={
+                'Content-Type': content_type,
+                'Content-Length': str(len(body))
+            }
+        )
+    session.mount('mock://', adapter)
+    return session
+
+
+def cached_names(session):
+    return sorted(
+        response.url.split('/')[-2]
+        for response in session.cache.responses.values()
+    )
+
+
+def test_bodies_are_compressed(tmp_path):
+    body = b'<p>What is new in Python</p>' * 4000
+    session = bounded_session(
+        tmp_path / 'cache', None, {'page': (body, 'text/html')}
+    )
+    session.get(PAGE_URL.format('page'))
+    response = session.get(PAGE_URL.format('page'))
+    assert response.from_cache and response.content == body
+    stats = cache_store.cache_stats(session.cache)
+    assert stats['body_bytes'] * 10 < len(body), (
+        'Тела ответов должны храниться в кеше в сжатом виде'
+    )
+
+
+def test_least_recently_used_evicted(tmp_path):
+    bodies = {
+        name: (os.urandom(2000), 'text/plain') for name in 'abcd'
+    }
+    session = bounded_session(tmp_path / 'cache', 9000, bodies)
+    for name in 'abc':
+        session.get(PAGE_URL.format(name))
+    session.get(PAGE_URL.format('a'))
+    session.get(PAGE_URL.format('d'))
+    assert cached_names(session) == ['a', 'c', 'd'], (
+        'При превышении размера кеша должны вытесняться '
+        'давно не использованные ответы'
+    )
+
+
+def test_large_binaries_not_cached(tmp_path):
+    session = bounded_session(tmp_path / 'cache', None, {
+        'archive': (b'0' * 100, 'application/zip'),
+        'page': (b'<html></html>', 'text/html'),
+    })
+    session.get(PAGE_URL.format('archive'))
+    session.get(PAGE_URL.format('page'))
+    assert cached_names(session) == ['page'], (
+        'Двоичные файлы не должны попадать в кеш'
+    )
+
+
+def test_cache_stats_hit_ratio(tmp_path):
+    session = bounded_session(tmp_path / 'cache', None, {})
+    cache_store.save_run_stats(session.cache, Counter(hit=2, miss=1))
+    cache_store.save_run_stats(
+        session.cache, Counter(hit=0, revalidated=1, miss=0)
+    )
+    stats = cache_store.cache_stats(session.cache)
+    assert (stats['hits'], stats['misses'], stats['hit_ratio']) == (
+        3, 1, 0.75
+    ), 'Доля попаданий должна считаться по всем запускам'
+
+
+def test_running_total_skips_scan_below_limit(tmp_path, monkeypatch):
+    responses = cache_store.BoundedSQLiteDict(
+        tmp_path / 'cache.sqlite', 'responses', serializer=None,
+        max_size=1000
+    )
+    scans = Counter()
+    total_size = responses.total_size
+
+    def counting_total_size(con):
+        scans['total_size'] += 1
+        return total_size(con)
+
+    monkeypatch.setattr(responses, 'total_size', counting_total_size)
+    for name in 'abc':
+        responses[name] = b'0' * 200
+    responses['a'] = b'0' * 100
+    assert scans['total_size'] == 0, (
+        'Запись в кеш ниже предела не должна пересчитывать его размер'
+    )
+    assert responses.total == 500
+    responses['d'] = b'0' * 600
+    assert responses.total == total_size(responses._connection) <= 900, (
+        'После вытеснения размер кеша должен совпадать с данными в базе'
+    )
+    del responses['d']
+    responses['e'] = b'0' * 10
+    assert responses.total == total_size(responses._connection)
@@ -0,0 +1,43 @@
+try:
+    from src import checkpoints
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `checkpoints.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `checkpoints.py`'
+
+HEADER = dict(version=1, name='pep', index='index')
+
+
+def test_journal_flushes_every_n(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    journal = checkpoints.Journal(path, HEADER, 2, False)
+    journal.record(0, (0, 'ok', None))
+    assert not path.exists(), (
+        'Контрольная точка должна сохраняться только каждые N страниц'
+    )
+    journal.record(1, (1, None, 'error'))
+    journal.record(2, (2, 'ok', None))
+    journal.flush()
+    assert checkpoints.read_journal(path, HEADER) == {
+        0: (0, 'ok', None), 2: (2, 'ok', None)
+    }, (
+        'При возобновлении страницы с ошибками должны загружаться заново'
+    )
+
+
+def test_journal_ignores_torn_tail_and_other_index(tmp_path):
+    path = tmp_path / 'checkpoint.jsonl'
+    journal = checkpoints.Journal(path, HEADER, 1, False)
+    journal.record(0, (0, 'ok', None))
+    with open(path, 'a') as file:
+        file.write('[[1, [1, "o')
+    assert checkpoints.read_journal(path, HEADER) == {0: (0, 'ok', None)}, (
+        'Недописанная строка журнала должна отбрасываться'
+    )
+    assert checkpoints.read_journal(
+        path, {**HEADER, 'index': 'other'}
+    ) is None, (
+        'Контрольная точка другой таблицы PEP 0 не должна использоваться'
+    )
+    journal.finish()
+    assert not path.exists(), 'Завершённый журнал должен удаляться'
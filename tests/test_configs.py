@@ -31,9 +31,123 @@ def test_configs_file():
     ),
     (
         argparse._StoreAction, ['-o', '--output'], 'output',
-        ('pretty', 'file'),
+        ('pretty', 'file', 'sqlite'),
         'Дополнительные способы вывода данных'
     ),
+    (
+        argparse._StoreAction, ['-w', '--workers'], 'workers',
+        None, 'Количество параллельных загрузок страниц'
+    ),
+    (
+        argparse._StoreAction, ['-p', '--parse-workers'], 'parse_workers',
+        None, 'Количество процессов для разбора страниц'
+    ),
+    (
+        argparse._StoreAction, ['-e', '--engine'], 'engine',
+        ('bs4', 'lxml'), 'Движок извлечения данных из страниц'
+    ),
+    (
+        argparse._StoreTrueAction, ['-i', '--incremental'], 'incremental',
+        None, 'Загружать только новые и изменившиеся PEP'
+    ),
+    (
+        argparse._StoreAction, ['--shard'], 'shard',
+        None, 'Обработать только часть I из N ссылок на PEP'
+    ),
+    (
+        argparse._StoreAction, ['--checkpoint-every'], 'checkpoint_every',
+        None, 'Сохранять прогресс обхода каждые N страниц'
+    ),
+    (
+        argparse._StoreTrueAction, ['--resume'], 'resume',
+        None, 'Продолжить обход с последней контрольной точки'
+    ),
+    (
+        argparse._StoreAction, ['--source'], 'source',
+        ('html', 'json', 'crosscheck'), 'Источник статусов PEP'
+    ),
+    (
+        argparse._StoreAction, ['--cache-backend'], 'cache_backend',
+        ('sqlite', 'compressed'), 'Хранилище кеша HTTP-запросов'
+    ),
+    (
+        argparse._StoreAction, ['--cache-size'], 'cache_size',
+        None, 'Наибольший размер сжатого кеша HTTP-запросов, МиБ'
+    ),
+    (
+        argparse._StoreAction, ['--snapshot'], 'snapshot',
+        None, 'Файл снимка кеша для cache-export и cache-import'
+    ),
+    (
+        argparse._StoreTrueAction, ['--offline'], 'offline',
+        None, 'Работать только с кешем, без запросов в сеть'
+    ),
+    (
+        argparse._StoreAction, ['--index-ttl'], 'index_ttl',
+        None, 'Время жизни кеша индексных страниц, секунд'
+    ),
+    (
+        argparse._StoreAction, ['--page-ttl'], 'page_ttl',
+        None, 'Время жизни кеша страниц PEP и статей, секунд'
+    ),
+    (
+        argparse._StoreAction, ['--extraction-cache-size'],
+        'extraction_cache_size', None,
+        'Сколько страниц хранить в кеше извлечённых данных, 0 - без кеша'
+    ),
+    (
+        argparse._StoreAction, ['-f', '--formats'], 'formats',
+        ('pdf-a4', 'pdf-letter', 'html', 'text', 'texinfo', 'epub'),
+        'Форматы архивов документации для загрузки'
+    ),
+    (
+        argparse._StoreAction, ['-s', '--segments'], 'segments',
+        None, 'Количество параллельных частей при загрузке архива'
+    ),
+    (
+        argparse._StoreAction, ['--pool-size'], 'pool_size',
+        None, 'Количество соединений с одним хостом'
+    ),
+    (
+        argparse._StoreAction, ['--rate'], 'rate',
+        None, 'Наибольшее число запросов к одному хосту в секунду'
+    ),
+    (
+        argparse._StoreAction, ['--timeout'], 'timeout',
+        None, 'Таймаут запроса, секунд'
+    ),
+    (
+        argparse._StoreAction, ['--retries'], 'retries',
+        None, 'Количество повторов запроса при сбое'
+    ),
+    (
+        argparse._StoreAction, ['--backoff'], 'backoff',
+        None, 'Базовая пауза между повторами, секунд'
+    ),
+    (
+        argparse._StoreAction, ['--interval'], 'interval',
+        None, 'Интервалы наблюдения: СЕКУНД или РЕЖИМ=СЕКУНД'
+    ),
+    (
+        argparse._StoreAction, ['--host'], 'host',
+        None, 'Адрес, на котором работает API'
+    ),
+    (
+        argparse._StoreAction, ['--port'], 'port',
+        None, 'Порт, на котором работает API'
+    ),
+    (
+        argparse._StoreAction, ['--results-ttl'], 'results_ttl',
+        None, 'Время жизни результатов в памяти API, секунд'
+    ),
+    (
+        argparse._StoreAction, ['-r', '--report'], 'report',
+        ('json', 'prometheus'), 'Сохранить отчёт о времени работы этапов'
+    ),
+    (
+        argparse._StoreTrueAction, ['--profile'], 'profile',
+        None, 'Сохранить профиль cProfile режима работы'
+    ),
 ])
 def test_configure_argument_parser(
         action,
@@ -66,3 +180,14 @@ def test_configure_argument_parser(
     assert got_action.help == help_str, (
         f'Укажите help-строку cli аргумента {got_action.dest}'
     )
+
+
+@pytest.mark.parametrize('option, value', [
+    ('--timeout', '0'),
+    ('--rate', '0'),
+    ('--workers', '0'),
+])
+def test_positive_options_reject_zero(option, value):
+    parser = configs.configure_argument_parser(('pep',))
+    with pytest.raises(SystemExit):
+        parser.parse_args(['pep', option, value])
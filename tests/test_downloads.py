@@ -0,0 +1,155 @@
+import json
+
+import pytest
+from requests import HTTPError
+
+try:
+    from src import downloads
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `downloads.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `downloads.py`'
+
+ARCHIVE_URL = 'https://docs.python.org/3/archives/docs.zip'
+DATA = bytes(range(100))
+NEW_DATA = bytes(reversed(range(100)))
+
+
+def serve_archive(adapter, data, etag):
+    def respond(request, context):
+        context.headers['ETag'] = etag
+        range_header = request.headers.get('Range')
+        if_range = request.headers.get('If-Range')
+        if range_header is None or if_range not in (None, etag):
+            context.status_code = 200
+            context.headers['Content-Length'] = str(len(data))
+            return data
+        start, _, end = range_header[len('bytes='):].partition('-')
+        start, end = int(start), int(end) if end else len(data) - 1
+        if start >= len(data):
+            context.status_code = 416
+            return b''
+        context.status_code = 206
+        context.headers['Content-Range'] = f'bytes {start}-{end}/{len(data)}'
+        context.headers['Content-Length'] = str(end - start + 1)
+        return data[start:end + 1]
+
+    adapter.register_uri('GET', ARCHIVE_URL, content=respond)
+    adapter.register_uri('HEAD', ARCHIVE_URL, headers={
+        'ETag': etag,
+        'Content-Length': str(len(data)),
+        'Accept-Ranges': 'bytes'
+    })
+
+
+@pytest.fixture
+def archive_session(mock_session):
+    mock_session.mount('https://', mock_session.mock_adapter)
+    return mock_session
+
+
+def leave_part(path, data, etag):
+    path.with_name(path.name + '.part').write_bytes(data)
+    path.with_name(path.name + '.part.json').write_text(
+        json.dumps(dict(validator=etag))
+    )
+
+
+def test_download_resumes_unchanged_file(archive_session, tmp_path):
+    serve_archive(archive_session.mock_adapter, DATA, '"v1"')
+    path = tmp_path / 'docs.zip'
+    leave_part(path, DATA[:40], '"v1"')
+    downloads.download_file(archive_session, ARCHIVE_URL, path)
+    request = archive_session.mock_adapter.last_request
+    assert request.headers['Range'] == 'bytes=40-'
+    assert request.headers['If-Range'] == '"v1"', (
+        'Докачка должна проверять, что файл не изменился, через If-Range'
+    )
+    assert path.read_bytes() == DATA
+    assert list(tmp_path.iterdir()) == [path], (
+        'После загрузки не должно оставаться временных файлов'
+    )
+
+
+def test_download_restarts_changed_file(archive_session, tmp_path):
+    serve_archive(archive_session.mock_adapter, NEW_DATA, '"v2"')
+    path = tmp_path / 'docs.zip'
+    leave_part(path, DATA[:40], '"v1"')
+    downloads.download_file(archive_session, ARCHIVE_URL, path)
+    assert path.read_bytes() == NEW_DATA, (
+        'Если файл на сервере изменился, его нужно загрузить заново, '
+        'а не дописывать к старому началу'
+    )
+
+
+def test_download_restarts_without_validator(archive_session, tmp_path):
+    serve_archive(archive_session.mock_adapter, NEW_DATA, '"v2"')
+    path = tmp_path / 'docs.zip'
+    path.with_name('docs.zip.part').write_bytes(DATA[:40])
+    downloads.download_file(archive_session, ARCHIVE_URL, path)
+    assert 'Range' not in archive_session.mock_adapter.last_request.headers
+    assert path.read_bytes() == NEW_DATA
+
+
+def test_download_restarts_on_416(archive_session, tmp_path):
+    serve_archive(archive_session.mock_adapter, DATA, '"v1"')
+    path = tmp_path / 'docs.zip'
+    leave_part(path, DATA + b'tail', '"v1"')
+    downloads.download_file(archive_session, ARCHIVE_URL, path)
+    assert archive_session.mock_adapter.call_count == 2
+    assert path.read_bytes() == DATA
+
+
+@pytest.mark.parametrize('size, segments, bounds', [
+    (100, 3, [(0, 33), (34, 67), (68, 99)]),
+    (10, 4, [(0, 2), (3, 5), (6, 8), (9, 9)]),
+    (2, 4, [(0, 0), (1, 1)]),
+])
+def test_segment_bounds(size, segments, bounds):
+    assert downloads.segment_bounds(size, segments) == bounds, (
+        'Сегменты должны покрывать файл целиком и без пересечений'
+    )
+
+
+def test_segmented_download(archive_session, tmp_path):
+    serve_archive(archive_session.mock_adapter, DATA, '"v1"')
+    path = tmp_path / 'docs.zip'
+    manifest_path = tmp_path / 'manifest.json'
+    downloads.sync_files(
+        archive_session, [(ARCHIVE_URL, path)], manifest_path, segments=3
+    )
+    ranges = sorted(
+        request.headers['Range']
+        for request in archive_session.mock_adapter.request_history
+        if request.method == 'GET'
+    )
+    assert ranges == ['bytes=0-33', 'bytes=34-67', 'bytes=68-99'], (
+        'Архив должен загружаться параллельными диапазонами байт'
+    )
+    assert path.read_bytes() == DATA
+    assert json.loads(manifest_path.read_text())['docs.zip']['sha256'] == (
+        downloads.file_sha256(path)
+    )
+
+
+def test_manifest_saved_on_failure(archive_session, tmp_path):
+    serve_archive(archive_session.mock_adapter, DATA, '"v1"')
+    broken_url = 'https://docs.python.org/3/archives/broken.zip'
+    archive_session.mock_adapter.register_uri(
+        'HEAD', broken_url, status_code=500
+    )
+    manifest_path = tmp_path / 'manifest.json'
+    with pytest.raises(HTTPError):
+        downloads.sync_files(
+            archive_session,
+            [
+                (broken_url, tmp_path / 'broken.zip'),
+                (ARCHIVE_URL, tmp_path / 'docs.zip')
+            ],
+            manifest_path,
+            workers=2
+        )
+    assert 'docs.zip' in json.loads(manifest_path.read_text()), (
+        'Сведения об уже загруженных архивах должны сохраняться, '
+        'даже если другой архив не загрузился'
+    )
@@ -0,0 +1,100 @@
+import pytest
+
+try:
+    from src import extractors
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `extractors.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `extractors.py`'
+
+PEP_PAGE = (
+    '<html><body><h1>PEP 8</h1><dl class="rfc2822 field-list simple">'
+    '<dt class="field-odd">Author<span class="colon">:</span></dt>'
+    '<dd class="field-odd">Guido van Rossum</dd>'
+    '<dt class="field-even">Status<span class="colon">:</span></dt>'
+    '<dd class="field-even"><abbr title="Accepted">Active</abbr></dd>'
+    '</dl><dl><dt>Status</dt><dd>Draft</dd></dl></body></html>'
+)
+WHATS_NEW_PAGE = (
+    '<html><body><section><h1>What’s New In Python 3.10'
+    '<a class="headerlink" href="#">¶</a></h1>'
+    '<dl class="field-list simple"><dt>Editor</dt>\n'
+    '<dd><p>Pablo Galindo Salgado</p>\n</dd></dl></section></body></html>'
+)
+
+PEP_PAGE_NO_STRING = (
+    '<html><body><dl><dt>Status</dt>\n<dd>\n<abbr>Final</abbr>\n</dd>'
+    '</dl></body></html>'
+)
+SIDEBAR_PAGE = (
+    '<html><body><div class="sphinxsidebar"><div class="sphinxsidebarwrapper">'
+    '<h3>Docs by version</h3><ul>'
+    '<li><a href="https://docs.python.org/3.12/">Python 3.12 (stable)</a></li>'
+    '<li><a href="https://docs.python.org/3.8/">Python <b>3.8</b> '
+    '(security-fixes)</a></li>'
+    '<li><a href="https://www.python.org/doc/versions/">All versions</a></li>'
+    '</ul><ul><li><a href="/other/">Other</a></li></ul></div></div>'
+    '</body></html>'
+)
+
+
+def test_extract_pep_status():
+    got = extractors.extract_pep_status(PEP_PAGE)
+    assert got == 'Active', (
+        'Функция `extract_pep_status` должна вернуть статус '
+        'из первого тега `dl` страницы PEP'
+    )
+    assert type(got) is str, (
+        'Функция `extract_pep_status` должна возвращать строку, '
+        'чтобы результат можно было передать между процессами'
+    )
+
+
+def test_extract_whats_new():
+    got = extractors.extract_whats_new(WHATS_NEW_PAGE)
+    assert got == (
+        'What’s New In Python 3.10¶',
+        'Editor Pablo Galindo Salgado '
+    ), (
+        'Функция `extract_whats_new` должна вернуть текст тегов `h1` и `dl`'
+    )
+
+
+def test_extract_json_statuses():
+    got = extractors.extract_json_statuses(
+        '{"8": {"number": 8, "status": "Active", '
+        '"url": "https://peps.python.org/pep-0008/"}}'
+    )
+    assert got == {'https://peps.python.org/pep-0008/': 'Active'}, (
+        'Функция `extract_json_statuses` должна вернуть словарь '
+        'статусов PEP по их адресам'
+    )
+
+
+@pytest.mark.parametrize('extractors_by_engine, page', [
+    (extractors.PEP_STATUS_EXTRACTORS, PEP_PAGE),
+    (extractors.PEP_STATUS_EXTRACTORS, PEP_PAGE_NO_STRING),
+    (extractors.WHATS_NEW_EXTRACTORS, WHATS_NEW_PAGE),
+    (extractors.VERSION_LINKS_EXTRACTORS, SIDEBAR_PAGE),
+])
+def test_engines_match(extractors_by_engine, page):
+    got = {
+        engine: extractor(page)
+        for engine, extractor in extractors_by_engine.items()
+    }
+    assert set(got) == {'bs4', 'lxml'}, (
+        'Для каждого поля должны быть извлекатели движков `bs4` и `lxml`'
+    )
+    assert got['lxml'] == got['bs4'], (
+        'Движок `lxml` должен извлекать из страницы те же данные, '
+        'что и движок `bs4`'
+    )
+
+
+def test_xpath_pep_status_no_dl():
+    with pytest.raises(BaseException) as excinfo:
+        extractors.xpath_pep_status('<html><body><p>PEP</p></body></html>')
+    assert excinfo.typename == 'ParserFindTagException', (
+        'Если на странице PEP нет тега `dl`, движок `lxml` '
+        'должен выбросить исключение `ParserFindTagException`'
+    )
@@ -1,3 +1,6 @@
+from argparse import Namespace
+import inspect
+import json
 from pathlib import Path
 
 import pytest
@@ -35,9 +38,10 @@ def test_main_file():
 def test_whats_new(mock_session):
     got = main.whats_new(mock_session)
     header = ('Ссылка на статью', 'Заголовок', 'Редактор, автор')
-    assert isinstance(got, list), (
-        'Функция `whats_new` должна возвращать объект типа `list`'
+    assert inspect.isgenerator(got), (
+        'Функция `whats_new` должна отдавать строки результата по одной'
     )
+    got = list(got)
     assert len(got) > 0, (
         'Убедитесь что функция `whats_new` модуля `main.py` '
         'возвращает непустой список'
@@ -56,9 +60,10 @@ def test_whats_new(mock_session):
 @pytest.mark.skip()
 def test_latest_versions(mock_session):
     got = main.latest_versions(mock_session)
-    assert isinstance(got, list), (
-        'Функция `latest_versions` должна возвращать объект типа `list`'
+    assert inspect.isgenerator(got), (
+        'Функция `latest_versions` должна отдавать строки результата по одной'
     )
+    got = list(got)
     assert isinstance(got[0], tuple), (
         'Функция `latest_versions` должна вернуть список `result`, '
         'элементами которого должны быть объекты типа `tuple`'
@@ -142,3 +147,319 @@ def test_mode_to_function():
             'В модуле `main.py` в объекте `MODE_TO_FUNCTION` '
             f'нет значения {func}'
         )
+
+
+def test_download_missing_format(mock_session, monkeypatch, tmp_path,
+                                 caplog):
+    adapter = mock_session.mock_adapter
+    mock_session.mount('https://', adapter)
+    archive_url = 'https://docs.python.org/3/archives/docs-pdf-a4.zip'
+    adapter.register_uri(
+        'GET', 'https://docs.python.org/3/download.html',
+        text=(
+            '<html><body><table class="docutils"><tr><td>'
+            '<a href="archives/docs-pdf-a4.zip">PDF</a>'
+            '</td></tr></table></body></html>'
+        )
+    )
+    adapter.register_uri('HEAD', archive_url, headers={'ETag': '"v1"'})
+    adapter.register_uri('GET', archive_url, content=b'archive')
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    main.download(mock_session, Namespace(formats=['pdf-a4', 'epub']))
+    assert (tmp_path / 'downloads' / 'docs-pdf-a4.zip').exists(), (
+        'Найденные архивы должны загружаться, даже если другого формата нет'
+    )
+    assert 'epub' in caplog.text, (
+        'В лог нужно вывести формат, которого нет на странице загрузок'
+    )
+
+
+WHATS_NEW_INDEX = (
+    '<html><body><section id="what-s-new-in-python">'
+    '<div class="toctree-wrapper"><ul>{}</ul></div></section></body></html>'
+).format(''.join(
+    f'<li class="toctree-l1"><a class="reference" href="3.{minor}.html">'
+    f'3.{minor}</a></li>'
+    for minor in range(3)
+))
+WHATS_NEW_PAGE = '<html><body><h1>3.{0}</h1><dl>Editor {0}</dl></body></html>'
+
+
+@pytest.fixture
+def whats_new_session(mock_session):
+    adapter = mock_session.mock_adapter
+    mock_session.mount('https://', adapter)
+    adapter.register_uri(
+        'GET', 'https://docs.python.org/3/whatsnew/', text=WHATS_NEW_INDEX
+    )
+    for minor in range(3):
+        adapter.register_uri(
+            'GET', f'https://docs.python.org/3/whatsnew/3.{minor}.html',
+            text=WHATS_NEW_PAGE.format(minor)
+        )
+    return mock_session
+
+
+def test_whats_new_resume_streams_rows(whats_new_session, monkeypatch,
+                                       tmp_path):
+    import checkpoints
+
+    monkeypatch.setattr(checkpoints, 'BASE_DIR', tmp_path)
+    adapter = whats_new_session.mock_adapter
+    cli_args = Namespace(workers=1, checkpoint_every=1)
+    results = main.whats_new(whats_new_session, cli_args)
+    next(results)
+    assert adapter.call_count == 1, (
+        'Заголовок таблицы должен выводиться до загрузки статей'
+    )
+    assert next(results)[1] == '3.0'
+    assert adapter.call_count == 2, (
+        'Строки `whats_new` должны выводиться по мере загрузки статей'
+    )
+    results.close()
+    cli_args.resume = True
+    got = list(main.whats_new(whats_new_session, cli_args))
+    assert [row[1] for row in got[1:]] == ['3.0', '3.1', '3.2'], (
+        'После возобновления строки из журнала не должны теряться '
+        'и повторяться'
+    )
+    assert not (tmp_path / 'state' / 'checkpoint_whats_new.jsonl').exists()
+
+
+def test_checkpoints_are_opt_in(pep_session, monkeypatch, tmp_path):
+    import checkpoints
+
+    monkeypatch.setattr(checkpoints, 'BASE_DIR', tmp_path)
+    list(main.pep(pep_session, Namespace(source='html', workers=1)))
+    assert not (tmp_path / 'state').exists(), (
+        'Без --checkpoint-every и --resume журнал не должен записываться'
+    )
+
+
+PEP_INDEX = (
+    '<html><body><table class="pep-zero-table docutils align-default">'
+    '<thead><tr><th>Status</th></tr></thead><tbody>'
+    '<tr><td><abbr>PF</abbr></td><td><a class="pep reference internal" '
+    'href="pep-0001/">1</a></td></tr>'
+    '<tr><td><abbr>SR</abbr></td><td><a class="pep reference internal" '
+    'href="pep-0002/">2</a></td></tr>'
+    '<tr><td></td><td><a class="pep reference internal" '
+    'href="pep-0003/">3</a></td></tr>'
+    '</tbody></table></body></html>'
+)
+PEP_PAGE = (
+    '<html><body><dl><dt>Status</dt><dd><abbr>{status}</abbr></dd></dl>'
+    '</body></html>'
+)
+PEP_STATUSES = {1: 'Final', 2: 'Rejected', 3: 'Draft'}
+
+
+@pytest.fixture
+def pep_session(mock_session):
+    adapter = mock_session.mock_adapter
+    mock_session.mount('https://', adapter)
+    adapter.register_uri('GET', 'https://peps.python.org/', text=PEP_INDEX)
+    adapter.register_uri(
+        'GET',
+        'https://peps.python.org/api/peps.json',
+        text=json.dumps({
+            str(number): dict(
+                number=number, status=status,
+                url=f'https://peps.python.org/pep-{number:04d}/'
+            )
+            for number, status in PEP_STATUSES.items()
+        })
+    )
+    for number, status in PEP_STATUSES.items():
+        adapter.register_uri(
+            'GET',
+            f'https://peps.python.org/pep-{number:04d}/',
+            text=PEP_PAGE.format(status=status)
+        )
+    return mock_session
+
+
+@pytest.mark.parametrize('source', ['html', 'json', 'crosscheck'])
+def test_pep_sources(pep_session, source):
+    got = list(main.pep(pep_session, Namespace(source=source, workers=1)))
+    assert got == [
+        ('Статус', 'Количество'),
+        ('Final', 1),
+        ('Rejected', 1),
+        ('Draft', 1),
+        ('Всего', 3)
+    ], (
+        'Функция `pep` должна возвращать одинаковую таблицу статусов '
+        f'для источника `{source}`'
+    )
+
+
+def test_pep_shards_merge(pep_session, monkeypatch, tmp_path):
+    from shards import load_shards
+
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    single = list(main.pep(pep_session, Namespace(source='html', workers=1)))
+    for index in (1, 2):
+        assert main.pep(pep_session, Namespace(
+            source='html', workers=1, shard=(index, 2)
+        )) is None, 'Часть прогона не должна выводить таблицу'
+    merged = list(main.pep_report(*load_shards(tmp_path / 'shards')))
+    assert merged == single, (
+        'Объединённые части должны давать ту же таблицу, что и один прогон'
+    )
+
+
+def test_pep_resume(pep_session, monkeypatch, tmp_path):
+    import checkpoints
+
+    monkeypatch.setattr(checkpoints, 'BASE_DIR', tmp_path)
+    track_progress = main.track_progress
+
+    def interrupted(items, total):
+        for done, item in enumerate(track_progress(items, total)):
+            if done == 2:
+                raise KeyboardInterrupt
+            yield item
+
+    cli_args = Namespace(source='html', workers=1, checkpoint_every=1)
+    monkeypatch.setattr(main, 'track_progress', interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        list(main.pep(pep_session, cli_args))
+    monkeypatch.setattr(main, 'track_progress', track_progress)
+    requested = []
+    html_source = main.PEP_SOURCES['html']
+
+    def spy(session, rows, cli_args):
+        requested.extend(pep_link for _, pep_link, _ in rows)
+        return html_source(session, rows, cli_args)
+
+    monkeypatch.setitem(main.PEP_SOURCES, 'html', spy)
+    cli_args.resume = True
+    got = list(main.pep(pep_session, cli_args))
+    assert got[-1] == ('Всего', 3), (
+        'После возобновления PEP не должны учитываться дважды'
+    )
+    assert requested == ['https://peps.python.org/pep-0003/'], (
+        'После возобновления должны загружаться только необработанные PEP'
+    )
+    assert not list((tmp_path / 'state').iterdir()), (
+        'После успешного прогона контрольная точка должна удаляться'
+    )
+
+
+def test_pep_incremental(pep_session, monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    cli_args = Namespace(source='html', workers=1, incremental=True)
+    list(main.pep(pep_session, cli_args))
+    pep_session.cache.clear()
+    adapter = pep_session.mock_adapter
+    adapter.register_uri(
+        'GET', 'https://peps.python.org/',
+        text=PEP_INDEX.replace('<td></td>', '<td><abbr>SA</abbr></td>')
+    )
+    adapter.register_uri(
+        'GET', 'https://peps.python.org/pep-0003/',
+        text=PEP_PAGE.format(status='Accepted')
+    )
+    requested = []
+    extract_pages = main.extract_pages
+
+    def spy(session, urls, *args):
+        requested.extend(urls)
+        return extract_pages(session, urls, *args)
+
+    monkeypatch.setattr(main, 'extract_pages', spy)
+    got = list(main.pep(pep_session, cli_args))
+    assert requested == ['https://peps.python.org/pep-0003/'], (
+        'Инкрементальный прогон должен загружать только изменившиеся PEP'
+    )
+    assert got == [
+        ('Статус', 'Количество'),
+        ('Final', 1),
+        ('Rejected', 1),
+        ('Accepted', 1),
+        ('Всего', 3)
+    ], 'Инкрементальный прогон должен объединять новые и сохранённые статусы'
+
+
+def test_pep_incremental_keeps_other_shards(pep_session, monkeypatch,
+                                            tmp_path):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    for index in (1, 2):
+        main.pep(pep_session, Namespace(
+            source='html', workers=1, incremental=True, shard=(index, 2)
+        ))
+    state = json.loads((tmp_path / 'state' / 'pep.json').read_text())
+    assert len(state['peps']) == len(PEP_STATUSES), (
+        'Прогон части PEP не должен стирать состояние остальных частей'
+    )
+
+
+def test_pep_incremental_json_source(pep_session, monkeypatch, tmp_path):
+    monkeypatch.setattr(main, 'BASE_DIR', tmp_path)
+    list(main.pep(pep_session, Namespace(
+        source='json', workers=1, incremental=True
+    )))
+    state = json.loads((tmp_path / 'state' / 'pep.json').read_text())
+    assert len(state['peps']) == len(PEP_STATUSES), (
+        'Инкрементальный режим должен сохранять состояние и для `json`'
+    )
+    requested = []
+    extract_pages = main.extract_pages
+
+    def spy(session, urls, *args):
+        requested.extend(urls)
+        return extract_pages(session, urls, *args)
+
+    monkeypatch.setattr(main, 'extract_pages', spy)
+    list(main.pep(pep_session, Namespace(
+        source='html', workers=1, incremental=True
+    )))
+    assert requested == [], (
+        'Статусы, сохранённые из `json`, не должны загружаться повторно'
+    )
+
+
+def test_pep_json_source_requests(pep_session):
+    list(main.pep(pep_session, Namespace(source='json', workers=1)))
+    assert pep_session.mock_adapter.call_count == 2, (
+        'С источником `json` функция `pep` должна загружать только '
+        'таблицу PEP 0 и `api/peps.json`'
+    )
+
+
+@pytest.mark.parametrize('mode_names, modes', [
+    (['pep'], ['pep']),
+    (['pep', 'latest-versions', 'pep'], ['pep', 'latest-versions']),
+    (['all'], ['whats-new', 'latest-versions', 'download', 'pep']),
+])
+def test_expand_modes(mode_names, modes):
+    assert main.expand_modes(mode_names) == modes, (
+        'Режим `all` должен раскрываться во все режимы, '
+        'повторы режимов должны отбрасываться'
+    )
+
+
+@pytest.mark.parametrize('mode_names, command, modes', [
+    (['pep'], None, ['pep']),
+    (['watch', 'pep'], 'watch', ['pep']),
+    (['watch'], 'watch', []),
+    (
+        ['serve', 'all'], 'serve',
+        ['whats-new', 'latest-versions', 'download', 'pep']
+    ),
+])
+def test_split_command(mode_names, command, modes):
+    assert main.split_command(None, mode_names) == (command, modes), (
+        'Команды `watch` и `serve` должны отделяться от режимов'
+    )
+
+
+@pytest.mark.parametrize('argv', [
+    ['serve', 'download'],
+    ['pep', 'latest-versions', '--shard', '1/2'],
+])
+def test_main_rejects_arguments(monkeypatch, argv):
+    monkeypatch.setattr('sys.argv', ['main.py', *argv])
+    with pytest.raises(SystemExit):
+        main.main()
@@ -0,0 +1,61 @@
+from functools import partial
+
+try:
+    from src import memo
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `memo.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `memo.py`'
+
+from utils import parse_pages
+
+PARSED = []
+
+
+def extract_upper(html):
+    PARSED.append(html)
+    return (html.upper(), len(html))
+
+
+def run(cache, pages):
+    PARSED.clear()
+    return list(cache.extract(
+        iter(pages), extract_upper,
+        partial(parse_pages, extractor=extract_upper)
+    ))
+
+
+def test_extraction_cache_skips_unchanged_pages(tmp_path):
+    cache = memo.ExtractionCache(tmp_path / 'extracted.sqlite3', 10, 'v1')
+    pages = [('a', None), (None, 'Сбой'), ('bb', None)]
+    expected = [(('A', 1), None), (None, 'Сбой'), (('BB', 2), None)]
+    assert run(cache, pages) == expected
+    assert PARSED == ['a', 'bb']
+    assert run(cache, pages + [('c', None)]) == expected + [(('C', 1), None)]
+    assert PARSED == ['c'], (
+        'Неизменившиеся страницы не должны разбираться повторно'
+    )
+    reopened = memo.ExtractionCache(tmp_path / 'extracted.sqlite3', 10, 'v1')
+    assert run(reopened, pages) == expected
+    assert PARSED == [], 'Кеш извлечённых данных должен сохраняться на диске'
+
+
+def test_extraction_cache_invalidated_by_version(tmp_path):
+    path = tmp_path / 'extracted.sqlite3'
+    run(memo.ExtractionCache(path, 10, 'v1'), [('a', None)])
+    run(memo.ExtractionCache(path, 10, 'v2'), [('a', None)])
+    assert PARSED == ['a'], (
+        'При изменении кода извлечения кеш должен сбрасываться'
+    )
+
+
+def test_extraction_cache_evicts_least_recently_used(tmp_path):
+    cache = memo.ExtractionCache(tmp_path / 'extracted.sqlite3', 2, 'v1')
+    run(cache, [('a', None), ('b', None)])
+    run(cache, [('a', None)])
+    run(cache, [('c', None)])
+    run(cache, [('a', None), ('b', None), ('c', None)])
+    assert PARSED == ['b'], (
+        'При переполнении кеша должны вытесняться давно не использованные '
+        'записи'
+    )
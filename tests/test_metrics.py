@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+try:
+    from src import metrics
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `metrics.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `metrics.py`'
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    for store in (
+        metrics.HISTOGRAMS, metrics.DURATIONS, metrics.ERRORS,
+        metrics.COUNTERS
+    ):
+        store.clear()
+    yield
+
+
+def test_observe_buckets():
+    metrics.observe('stage', 0.0005)
+    metrics.observe('stage', 0.001)
+    metrics.observe('stage', 0.3, failed=True)
+    metrics.observe('stage', 60)
+    stats = metrics.snapshot()['stages']['stage']
+    assert stats['count'] == 4
+    assert stats['errors'] == 1
+    assert stats['buckets']['0.001'] == 2, (
+        'Граница корзины гистограммы должна включать своё значение'
+    )
+    assert stats['buckets']['0.5'] == 1
+    assert stats['buckets']['+Inf'] == 1
+
+
+def test_snapshot_extra_and_counters():
+    metrics.increment('bytes', 10)
+    metrics.increment('bytes', 5)
+    data = metrics.snapshot(cache={'hit': 3})
+    assert data['counters'] == {'bytes': 15}
+    assert data['cache'] == {'hit': 3}
+    assert data['stages'] == {}
+
+
+def test_prometheus_lines():
+    metrics.observe('find_tag', 0.002)
+    metrics.observe('find_tag', 0.02, failed=True)
+    metrics.increment('bytes', 7)
+    lines = list(metrics.prometheus_lines(metrics.snapshot(
+        limits={'peps.python.org': dict(rate=2.0, concurrency=4)}
+    )))
+    assert 'bs4_parser_stage_seconds_bucket{stage="find_tag",le="0.001"} 0' in (
+        lines
+    )
+    assert 'bs4_parser_stage_seconds_bucket{stage="find_tag",le="0.005"} 1' in (
+        lines
+    )
+    assert 'bs4_parser_stage_seconds_bucket{stage="find_tag",le="+Inf"} 2' in (
+        lines
+    ), 'Корзины гистограммы Prometheus должны быть накопительными'
+    assert 'bs4_parser_stage_seconds_count{stage="find_tag"} 2' in lines
+    assert 'bs4_parser_stage_errors_total{stage="find_tag"} 1' in lines
+    assert 'bs4_parser_bytes_total 7' in lines
+    assert 'bs4_parser_host_concurrency{host="peps.python.org"} 4' in lines
+
+
+def test_timed_consumer_excludes_producer():
+    def slow_rows():
+        for row in range(3):
+            time.sleep(0.05)
+            yield row
+
+    @metrics.timed_consumer('output')
+    def consume(results):
+        return list(results)
+
+    assert consume(slow_rows()) == [0, 1, 2]
+    stats = metrics.snapshot()['stages']['output']
+    assert stats['total_seconds'] < 0.05, (
+        'Время вывода не должно включать время работы режима'
+    )
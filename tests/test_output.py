@@ -1,6 +1,7 @@
 from argparse import Namespace
 from datetime import datetime
 from pathlib import Path
+import sqlite3
 from typing import Optional
 
 import pytest
@@ -82,6 +83,94 @@ def test_control_output_file(monkeypatch, tmp_path, records, cli_arg):
     )
 
 
+@pytest.mark.parametrize('cli_arg, table', [
+    (cli_args('whats-new', 'sqlite'), 'whats_new'),
+    (cli_args('latest-versions', 'sqlite'), 'latest_versions'),
+])
+def test_control_output_sqlite(monkeypatch, tmp_path, records, cli_arg,
+                               table):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    records = records(cli_arg.mode)
+    outputs.control_output(records, cli_arg)
+    outputs.control_output(records, cli_arg)
+    connection = sqlite3.connect(tmp_path / 'results.sqlite3')
+    got = connection.execute(
+        f'SELECT * FROM {table} ORDER BY run_at, position'
+    ).fetchall()
+    connection.close()
+    assert [row[2:] for row in got] == records[1:] * 2, (
+        'Убедитесь что при выводе в sqlite строки результата без заголовка '
+        f'сохраняются в таблицу `{table}` при каждом запуске'
+    )
+
+
+def test_control_output_sqlite_pep(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    table = [
+        ('Статус', 'Количество'),
+        ('Final', 9),
+        ('Active', 10),
+        ('Всего', 19)
+    ]
+    outputs.control_output(table, cli_args('pep', 'sqlite'))
+    outputs.control_output(table, cli_args('pep', 'sqlite'))
+    connection = sqlite3.connect(tmp_path / 'results.sqlite3')
+    got = connection.execute(
+        'SELECT status, count, typeof(count) FROM pep '
+        'ORDER BY run_at, count DESC'
+    ).fetchall()
+    totals = connection.execute(
+        'SELECT SUM(count) FROM pep GROUP BY run_at'
+    ).fetchall()
+    connection.close()
+    assert got == [
+        ('Active', 10, 'integer'), ('Final', 9, 'integer')
+    ] * 2, (
+        'Количество PEP должно храниться числом, чтобы его можно было '
+        'сортировать и суммировать'
+    )
+    assert totals == [(19,), (19,)], (
+        'Итоговая строка не должна попадать в таблицу `pep`, '
+        'иначе PEP считаются дважды'
+    )
+
+
+def test_control_output_sqlite_cache_stats(monkeypatch, tmp_path):
+    monkeypatch.setattr(outputs, 'BASE_DIR', Path(tmp_path))
+    stats = [
+        ('Показатель', 'Значение'),
+        ('Записей', 3),
+        ('Доля попаданий, %', 87.5)
+    ]
+    outputs.control_output(stats, cli_args('cache-stats', 'sqlite'))
+    connection = sqlite3.connect(tmp_path / 'results.sqlite3')
+    got = connection.execute(
+        'SELECT metric, value FROM cache_stats ORDER BY position'
+    ).fetchall()
+    connection.close()
+    assert got == stats[1:], (
+        'Вывод команды `cache-stats` должен сохраняться в таблицу '
+        '`cache_stats`'
+    )
+
+
+def test_control_output_streams_rows(capsys):
+    def rows():
+        yield ('Статус', 'Количество')
+        yield ('Active', 36)
+        captured_out, _ = capsys.readouterr()
+        assert 'Active 36' in captured_out, (
+            'Строки результата должны выводиться по мере поступления'
+        )
+        yield ('Всего', 36)
+
+    outputs.control_output(rows(), cli_args('pep', None))
+    captured_out, _ = capsys.readouterr()
+    assert 'Всего 36' in captured_out, (
+        'Проверьте вывод в консоль для потока строк'
+    )
+
+
 def test_output_file():
     assert hasattr(outputs, 'control_output'), (
         'Напишите функцию `control_output` в модуле `output.py`'
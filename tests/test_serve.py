@@ -0,0 +1,63 @@
+import json
+from threading import Thread
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+try:
+    from src import serve
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `serve.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `serve.py`'
+
+
+@pytest.fixture
+def api():
+    store = serve.ResultStore(['pep', 'whats-new'], ttl=60)
+    server = serve.create_server(store, '127.0.0.1', 0)
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield store, 'http://127.0.0.1:{}/'.format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+def test_store_runs_one_refresh_per_mode():
+    store = serve.ResultStore(['pep'], ttl=60)
+    assert store.due() == ['pep'], 'Режим без результатов нужно обновить'
+    assert store.due() == [], (
+        'Пока режим обновляется, второе обновление запускаться не должно'
+    )
+    store.store('pep', body=b'{}')
+    assert store.due() == [], (
+        'Свежие результаты не должны обновляться до истечения TTL'
+    )
+    store.expire()
+    assert store.due() == ['pep'], (
+        'После сброса результаты режима нужно обновить'
+    )
+
+
+def test_api_serves_results(api):
+    store, url = api
+    store.store('pep', body=serve.results_body(
+        'pep', [('Статус', 'Количество'), ('Final', 1), ('Всего', 1)]
+    ))
+    with urlopen(url + 'pep') as response:
+        got = json.load(response)
+    assert got['columns'] == ['Статус', 'Количество']
+    assert got['rows'] == [['Final', 1], ['Всего', 1]], (
+        'API должно отдавать строки результатов режима в JSON'
+    )
+    store.store('whats-new', error='Сбой')
+    with pytest.raises(HTTPError) as excinfo:
+        urlopen(url + 'whats-new')
+    assert excinfo.value.code == 503, (
+        'Если результатов режима нет, API должно отвечать 503'
+    )
+    with pytest.raises(HTTPError) as excinfo:
+        urlopen(url + 'download')
+    assert excinfo.value.code == 404, (
+        'Для неизвестного режима API должно отвечать 404'
+    )
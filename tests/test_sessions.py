@@ -0,0 +1,47 @@
+from argparse import Namespace
+
+try:
+    from src import sessions
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `sessions.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `sessions.py`'
+
+
+def test_create_session_mounts_tuned_adapter():
+    cli_args = Namespace(pool_size=32, timeout=5.0, retries=4, backoff=0.2)
+    session = sessions.create_session(cli_args, backend='memory')
+    for prefix in ('https://', 'http://'):
+        adapter = session.get_adapter(prefix + 'peps.python.org/')
+        assert isinstance(adapter, sessions.TunedHTTPAdapter), (
+            'Сессия должна использовать настроенный транспортный адаптер'
+        )
+    assert adapter._pool_maxsize == 32, (
+        'Размер пула соединений должен задаваться опцией --pool-size'
+    )
+    assert adapter.timeout == 5.0, (
+        'Таймаут запроса должен задаваться опцией --timeout'
+    )
+    retry = adapter.max_retries
+    assert retry.total == 4 and retry.backoff_factor == 0.2, (
+        'Повторы запроса должны задаваться опциями --retries и --backoff'
+    )
+    assert {429, 503}.issubset(retry.status_forcelist), (
+        'Запрос должен повторяться при ответах 429 и 5xx'
+    )
+    assert retry.respect_retry_after_header, (
+        'Пауза перед повтором должна учитывать заголовок Retry-After'
+    )
+
+
+def test_jitter_retry_backoff():
+    retry = sessions.JitterRetry(total=5, backoff_factor=1)
+    for _ in range(3):
+        retry = retry.increment(method='GET', url='/')
+    base = sessions.Retry.get_backoff_time(retry)
+    for _ in range(20):
+        backoff = retry.get_backoff_time()
+        assert base <= backoff <= base * (1 + sessions.RETRY_JITTER), (
+            'Пауза между повторами должна расти экспоненциально '
+            'со случайной добавкой'
+        )
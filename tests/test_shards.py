@@ -0,0 +1,30 @@
+import pytest
+
+try:
+    from src import shards
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `shards.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `shards.py`'
+
+from exceptions import ParserShardException
+
+LINKS = [f'https://peps.python.org/pep-{number:04d}/' for number in range(50)]
+
+
+def test_every_link_in_one_shard():
+    shard_sizes = [
+        sum(shards.in_shard(link, (index, 4)) for link in LINKS)
+        for index in range(1, 5)
+    ]
+    for link in LINKS:
+        assert sum(
+            shards.in_shard(link, (index, 4)) for index in range(1, 5)
+        ) == 1, 'Каждая ссылка должна попадать ровно в одну часть'
+    assert all(shard_sizes), 'Ссылки должны распределяться по всем частям'
+
+
+def test_missing_shards_not_merged(tmp_path):
+    shards.save_shard(tmp_path, (1, 2), 'index', [], [])
+    with pytest.raises(ParserShardException, match=r'\[2\]'):
+        shards.load_shards(tmp_path)
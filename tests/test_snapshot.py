@@ -0,0 +1,62 @@
+import json
+import tarfile
+
+import pytest
+from requests_cache import CachedSession
+from requests_mock import Adapter
+
+try:
+    from src import snapshot
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `snapshot.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `snapshot.py`'
+
+from cache_store import BoundedSQLiteCache
+from exceptions import ParserSnapshotException
+
+PAGE_URL = 'mock://peps.python.org/pep-0008/'
+
+
+def make_session(node_dir, **kwargs):
+    session = CachedSession(
+        backend=BoundedSQLiteCache(node_dir / 'http_cache'), **kwargs
+    )
+    adapter = Adapter()
+    adapter.register_uri('GET', PAGE_URL, text='<dl>Final</dl>')
+    session.mount('mock://', adapter)
+    return session, adapter
+
+
+def test_snapshot_round_trip(tmp_path, monkeypatch):
+    exporter_dir, importer_dir = tmp_path / 'exporter', tmp_path / 'importer'
+    for node_dir in (exporter_dir, importer_dir):
+        (node_dir / 'state').mkdir(parents=True)
+    (exporter_dir / 'state' / 'pep.json').write_text('{"version": 1}')
+    monkeypatch.setattr(snapshot, 'BASE_DIR', exporter_dir)
+    session, _ = make_session(exporter_dir)
+    session.get(PAGE_URL)
+    snapshot.export_snapshot(session, tmp_path / 'snap.tar.gz', 'compressed')
+
+    monkeypatch.setattr(snapshot, 'BASE_DIR', importer_dir)
+    session, adapter = make_session(importer_dir, only_if_cached=True)
+    snapshot.import_snapshot(session, tmp_path / 'snap.tar.gz', 'compressed')
+    response = session.get(PAGE_URL)
+    assert response.from_cache and response.text == '<dl>Final</dl>', (
+        'После загрузки снимка ответы должны браться из кеша'
+    )
+    assert adapter.call_count == 0
+    assert (importer_dir / 'state' / 'pep.json').read_text() == (
+        '{"version": 1}'
+    ), 'Снимок должен переносить сохранённое состояние'
+
+
+def test_snapshot_version_checked(tmp_path):
+    path = tmp_path / 'snap.tar.gz'
+    manifest = tmp_path / 'manifest.json'
+    manifest.write_text(json.dumps({'version': 0, 'files': {}}))
+    with tarfile.open(path, 'w:gz') as archive:
+        archive.add(manifest, arcname='manifest.json')
+    session, _ = make_session(tmp_path)
+    with pytest.raises(ParserSnapshotException):
+        snapshot.import_snapshot(session, path, 'compressed')
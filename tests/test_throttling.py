@@ -0,0 +1,61 @@
+try:
+    from src import throttling
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `throttling.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `throttling.py`'
+
+
+def run_requests(limiter, latencies, throttled=False):
+    for seconds in latencies:
+        limiter.acquire()
+        limiter.release(seconds, throttled)
+
+
+def test_limiter_grows_while_healthy():
+    limiter = throttling.HostLimiter(max_rate=1000, max_concurrency=8)
+    start = limiter.snapshot()['concurrency']
+    run_requests(limiter, [0.05] * 100)
+    limits = limiter.snapshot()
+    assert start < limits['concurrency'] <= 8, (
+        'Число одновременных запросов должно расти, пока задержка '
+        'не растёт, и не превышать размер пула'
+    )
+    assert limits['active'] == 0, (
+        'После завершения запросов не должно оставаться активных'
+    )
+
+
+def test_limiter_backs_off():
+    limiter = throttling.HostLimiter(max_rate=1000, max_concurrency=8)
+    run_requests(limiter, [0.05] * 100)
+    healthy = limiter.snapshot()
+    run_requests(limiter, [0.05], throttled=True)
+    throttled = limiter.snapshot()
+    assert throttled['rate'] < healthy['rate'], (
+        'Ответ 429/503 должен снижать частоту запросов'
+    )
+    assert throttled['concurrency'] < healthy['concurrency'], (
+        'Ответ 429/503 должен снижать число одновременных запросов'
+    )
+    run_requests(limiter, [0.5] * 10)
+    assert limiter.snapshot()['concurrency'] == 1, (
+        'Рост задержки должен снижать число одновременных запросов'
+    )
+
+
+def test_limiter_recovers_after_latency_step():
+    limiter = throttling.HostLimiter(max_rate=1000, max_concurrency=8)
+    run_requests(limiter, [0.01] + [0.2] * 200)
+    assert limiter.snapshot()['concurrency'] > 1, (
+        'Один быстрый ответ не должен навсегда занижать базовую задержку'
+    )
+    run_requests(limiter, [0.5] * 20)
+    assert limiter.snapshot()['concurrency'] == 1, (
+        'Скачок задержки должен снижать число одновременных запросов'
+    )
+    run_requests(limiter, [0.05] * 200)
+    assert limiter.snapshot()['concurrency'] == 8, (
+        'Когда задержка снова падает, число одновременных запросов '
+        'должно восстанавливаться'
+    )
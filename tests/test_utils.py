@@ -1,3 +1,6 @@
+from concurrent.futures import ThreadPoolExecutor
+import time
+
 import bs4
 import pytest
 import requests
@@ -55,3 +58,93 @@ def test_get_response(mock_session):
             'делает запрос к странице и возвращает ответ. \n'
             'Кстати: You are breathtaken!'
         )
+
+
+def test_get_response_counts_cache(mock_session):
+    url = 'mock://docs.python.org/3/counted/'
+    before = dict(utils.CACHE_STATS)
+    utils.get_response(mock_session, url)
+    utils.get_response(mock_session, url)
+    assert utils.CACHE_STATS['miss'] - before['miss'] == 1, (
+        'Первый запрос к странице должен учитываться как промах кеша'
+    )
+    assert utils.CACHE_STATS['hit'] - before['hit'] == 1, (
+        'Повторный запрос к странице должен учитываться как попадание в кеш'
+    )
+
+
+def test_get_response_single_flight(mock_session):
+    url = 'mock://docs.python.org/3/shared/'
+
+    def slow_page(request, context):
+        time.sleep(0.1)
+        return 'shared page'
+
+    mock_session.mock_adapter.register_uri('GET', url, text=slow_page)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        pages = list(executor.map(
+            lambda _: utils.get_response(mock_session, url).text, range(4)
+        ))
+    assert pages == ['shared page'] * 4, (
+        'Функция `get_response` должна вернуть страницу каждому потоку'
+    )
+    assert mock_session.mock_adapter.call_count == 1, (
+        'Одновременные запросы одной страницы должны выполняться один раз'
+    )
+    assert utils.IN_FLIGHT == {}, (
+        'После завершения запросов не должно оставаться записей о них'
+    )
+
+
+def test_parse_page_reuses_unchanged_page(mock_session):
+    url = 'mock://docs.python.org/3/parsed/'
+    pages = iter(['first', 'first', 'second'])
+    mock_session.mock_adapter.register_uri(
+        'GET', url, text=lambda request, context: next(pages)
+    )
+    mock_session.settings.expire_after = 0
+    parsed = []
+
+    def parser(html):
+        parsed.append(html)
+        return html.upper()
+
+    got = [utils.parse_page(mock_session, url, parser) for _ in range(3)]
+    assert got == ['FIRST', 'FIRST', 'SECOND'], (
+        'Функция `parse_page` должна возвращать результат разбора '
+        'актуальной версии страницы'
+    )
+    assert parsed == ['first', 'second'], (
+        'Неизменившаяся страница не должна разбираться повторно'
+    )
+
+
+def test_get_response_offline(mock_session):
+    mock_session.settings.only_if_cached = True
+    with pytest.raises(ConnectionError, match='нет в кеше'):
+        utils.get_response(mock_session, 'mock://docs.python.org/3/offline/')
+    assert mock_session.mock_adapter.call_count == 0, (
+        'В режиме --offline запросы в сеть выполняться не должны'
+    )
+
+
+@pytest.mark.parametrize('parse_workers', [1, 2])
+def test_parse_pages_records_extract_stage(parse_workers):
+    import metrics
+    from extractors import extract_json_statuses
+
+    before = sum(metrics.HISTOGRAMS['extract'])
+    page = '{"1": {"url": "pep-0001", "status": "Final"}}'
+    got = list(utils.parse_pages(
+        [(page, None), (None, 'error'), (page, None)],
+        extract_json_statuses,
+        parse_workers
+    ))
+    assert got == [
+        ({'pep-0001': 'Final'}, None), (None, 'error'),
+        ({'pep-0001': 'Final'}, None)
+    ]
+    assert sum(metrics.HISTOGRAMS['extract']) - before == 2, (
+        'Время извлечения данных должно учитываться и при разборе '
+        'в отдельных процессах'
+    )
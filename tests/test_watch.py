@@ -0,0 +1,50 @@
+from argparse import Namespace
+from threading import Lock
+
+import outputs
+
+try:
+    from src import watch
+except ModuleNotFoundError:
+    assert False, 'Убедитесь что в директории `src` есть файл `watch.py`'
+except ImportError:
+    assert False, 'Убедитесь что в директории `src` есть файл `watch.py`'
+
+
+def test_watch_intervals():
+    cli_args = Namespace(interval=[(None, 30.0), ('pep', 5.0)])
+    assert watch.watch_intervals(cli_args, ['pep', 'whats-new']) == {
+        'pep': 5.0, 'whats-new': 30.0
+    }, (
+        'Интервал `РЕЖИМ=СЕКУНД` должен задаваться режиму, '
+        'интервал без режима - всем остальным'
+    )
+    assert watch.watch_intervals(Namespace(interval=()), ['pep']) == {
+        'pep': watch.DEFAULT_WATCH_INTERVAL
+    }, 'Без `--interval` должен использоваться интервал по умолчанию'
+
+
+def test_watch_outputs_only_changes(monkeypatch):
+    tables = iter([[('a', 1)], [('a', 1)], [('a', 2)]])
+    events = {}
+    written = []
+
+    def mode(session, cli_args):
+        table = next(tables, None)
+        if table is None:
+            events['stop'] = 'SIGTERM'
+            return [('a', 2)]
+        return table
+
+    monkeypatch.setattr(
+        outputs, 'control_output',
+        lambda results, cli_args: written.append((cli_args.mode, results))
+    )
+    watch.watch_loop(
+        None, Namespace(mode=['watch'], output=None), ['pep'],
+        {'pep': mode}, {'pep': 0}, events, Lock()
+    )
+    assert written == [('pep', [('a', 1)]), ('pep', [('a', 2)])], (
+        'В режиме наблюдения результаты должны выводиться только '
+        'при их изменении'
+    )